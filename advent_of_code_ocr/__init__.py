@@ -2,14 +2,15 @@
 
 from itertools import groupby
 
-import numpy as np
-
 from .characters import ALPHABET_6
 
 __version__ = "0.2.0"
 
 
 def convert_6(input_text: str, *, fill_pixel: str = "#", empty_pixel: str = "."):
+    # numpy is slow to import, so only pay for it once there's something to convert
+    import numpy as np
+
     input_text = input_text.replace(fill_pixel, "1").replace(empty_pixel, "0")
 
     array = np.array([[int(char) for char in row] for row in input_text.split("\n")])
@@ -4,6 +4,7 @@ from typing import List
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.parse import ints
 
 aoc_day = 2
 
@@ -26,11 +27,8 @@ class Box:
 
 
 def preprocess():
-    dimensions = []
-    for line in aocd.get_data(day=aoc_day, year=aoc_year).splitlines():
-        l, w, h = line.split("x")
-        dimensions.append(Box(l=int(l), w=int(w), h=int(h)))
-    return dimensions
+    sides = ints(aocd.get_data(day=aoc_day, year=aoc_year), columns=3)
+    return [Box(l, w, h) for l, w, h in sides.tolist()]
 
 
 def part1(measurements: List[Box]):
@@ -53,18 +51,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
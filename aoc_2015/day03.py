@@ -73,18 +73,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
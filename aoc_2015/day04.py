@@ -5,7 +5,8 @@ import aocd
 from . import aoc_year
 from loguru import logger
 
-import _md5
+from aoc_common.log import log
+from aoc_common.md5search import first_hits
 
 aoc_day = 4
 
@@ -15,13 +16,9 @@ def preprocess():
 
 
 def find_suffix(secret: str, prefix: str = "00000"):
-    i = 0
-    found = False
-    while not found:
-        i += 1
-        digest = _md5.md5(f"{secret}{i}".encode()).hexdigest()
-        if digest.startswith(prefix):
-            return i
+    hits, stats = first_hits(secret, prefix, start=1)
+    log.info("find_suffix {}: {}", prefix, stats)
+    return hits[0][0]
 
 
 def part1(secret: str):
@@ -43,18 +40,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
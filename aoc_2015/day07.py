@@ -124,18 +124,9 @@ NOT y -> i
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -7,10 +7,14 @@ from dataclasses import dataclass
 from functools import cache, lru_cache
 from itertools import product
 from math import prod
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Tuple, Set, TYPE_CHECKING
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.bitarray import WINDOW, BitBoard
+
+if TYPE_CHECKING:
+    from aoc_common.grid import Grid
 
 aoc_day = 18
 try:
@@ -44,92 +48,107 @@ def preprocess():
 
 class LightDisplay:
     context: AOCContext
-    grid_h: int
-    grid_w: int
-    lit: Set[Tuple[int, int]]
+    lights: "Grid"
     always_on: Set[Tuple[int, int]]
 
     def __init__(self, context: AOCContext, always_on=None):
+        # the grid is numpy, which is slow to import, so the bitboard variants don't load it
+        from aoc_common.grid import Grid
+
         self.context = context
-        self.grid_h = len(context.raw)
-        self.grid_w = len(context.raw[0])
         if always_on:
             self.always_on = always_on
         else:
             self.always_on = set()
-        self.lit = self.get_starting_configuration()
-
-    def get_starting_configuration(self):
-        return {
-            (x, y)
-            for y, x in product(range(self.grid_w), range(self.grid_h))
-            if self.context.raw[y][x] == "#" or (x, y) in self.always_on
-        }
-
-    def find_neighbors(self, x: int, y: int):
-        if x > 0:
-            yield x - 1, y
-            if y > 0:
-                yield x - 1, y - 1
-            if y < self.grid_h - 1:
-                yield x - 1, y + 1
-        if x < self.grid_w - 1:
-            yield x + 1, y
-            if y > 0:
-                yield x + 1, y - 1
-            if y < self.grid_h - 1:
-                yield x + 1, y + 1
-        if y > 0:
-            yield x, y - 1
-        if y < self.grid_h - 1:
-            yield x, y + 1
-
-    @cache
-    def get_neighbors(self, x: int, y: int):
-        return list(self.find_neighbors(x, y))
+        # the padding is a border of lights that are always off
+        self.lights = Grid.from_chars(context.raw, {"#": 1}, pad_value=0)
+        self.turn_on_always_on()
+
+    @property
+    def lit(self) -> int:
+        return int(self.lights.values.sum())
+
+    def turn_on_always_on(self):
+        for x, y in self.always_on:
+            self.lights.values[y, x] = 1
 
     def update(self, cycles: int):
-        logger.debug(f"Before update: {len(self.lit)} lights are on.")
-
-        def now_lit(x, y):
-            if (x, y) in self.always_on:
-                return True
-            lit_neighbors = sum(
-                (nx, ny) in self.lit for nx, ny in self.get_neighbors(x, y)
-            )
-            if (x, y) not in self.lit:
-                if lit_neighbors == 3:
-                    return True
-                else:
-                    return False
-            if (x, y) in self.lit:
-                if 2 <= lit_neighbors <= 3:
-                    return True
-                else:
-                    return False
+        logger.debug(f"Before update: {self.lit} lights are on.")
+        for c in range(cycles):
+            lit_neighbors = self.lights.neighbor_sum(8)
+            on = self.lights.values
+            on[...] = (lit_neighbors == 3) | ((on == 1) & (lit_neighbors == 2))
+            self.turn_on_always_on()
+            logger.debug(f"After update {c + 1}: {self.lit} lights are on.")
+
+
+NEIGHBORS = [(dx, dy) for dx, dy in WINDOW if dx or dy]
 
+
+class BitLightDisplay:
+    """LightDisplay on a BitBoard: each cycle counts every light's neighbors at once with bitwise adders."""
+
+    lights: BitBoard
+    always_on: BitBoard
+
+    def __init__(self, context: AOCContext, always_on=None):
+        self.lights = BitBoard.from_lines(context.raw)
+        self.always_on = BitBoard(self.lights.w, self.lights.h)
+        for x, y in always_on or ():
+            self.always_on.set(x, y)
+        self.lights |= self.always_on
+
+    @property
+    def lit(self) -> int:
+        return self.lights.count()
+
+    def update(self, cycles: int):
+        w, h = self.lights.w, self.lights.h
         for c in range(cycles):
-            self.lit = {
-                (x, y)
-                for x, y in product(range(self.grid_w), range(self.grid_h))
-                if now_lit(x, y)
-            }
-            logger.debug(f"After update {c + 1}: {len(self.lit)} lights are on.")
+            # the neighbor count in binary, with fours set for anything from 4 to 8
+            ones, twos, fours = BitBoard(w, h), BitBoard(w, h), BitBoard(w, h)
+            for dx, dy in NEIGHBORS:
+                neighbor = self.lights.shifted(dx, dy)
+                carry = ones & neighbor
+                ones ^= neighbor
+                fours |= twos & carry
+                twos ^= carry
+            stay = ~fours & twos
+            self.lights = (stay & ones) | (stay & self.lights) | self.always_on
+            logger.debug(f"After update {c + 1}: {self.lit} lights are on.")
+
+
+def corners(context: AOCContext):
+    max_x = len(context.raw[0]) - 1
+    max_y = len(context.raw) - 1
+    return {(0, 0), (0, max_y), (max_x, max_y), (max_x, 0)}
 
 
 def part1(context: AOCContext):
     display = LightDisplay(context)
     display.update(100)
-    return str(len(display.lit))
+    return str(display.lit)
 
 
 def part2(context: AOCContext):
-    max_x = len(context.raw[0]) - 1
-    max_y = len(context.raw) - 1
-    always_on = {(0, 0), (0, max_y), (max_x, max_y), (max_x, 0)}
-    display = LightDisplay(context, always_on=always_on)
+    display = LightDisplay(context, always_on=corners(context))
+    display.update(100)
+    return str(display.lit)
+
+
+def part1_bitboard(context: AOCContext):
+    display = BitLightDisplay(context)
     display.update(100)
-    return str(len(display.lit))
+    return str(display.lit)
+
+
+def part2_bitboard(context: AOCContext):
+    display = BitLightDisplay(context, always_on=corners(context))
+    display.update(100)
+    return str(display.lit)
+
+
+variants = {"part1": [part1_bitboard], "part2": [part2_bitboard]}
 
 
 tests = [
@@ -145,18 +164,9 @@ Dublin to Belfast = 141
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
+    from aoc_runner.testing import run_module_cases
 
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,6 @@ from itertools import product
 from math import prod
 from typing import List, Dict, Any, Tuple
 import aocd
-import numpy
 
 from . import aoc_year
 from loguru import logger
@@ -46,6 +45,8 @@ def preprocess():
 
 
 def part1(context: AOCContext):
+    import numpy
+
     min_deliveries = context.presents // 10
     max_houses = min_deliveries
     logger.info(
@@ -64,6 +65,8 @@ def part1(context: AOCContext):
 
 
 def part2(context: AOCContext):
+    import numpy
+
     min_deliveries = context.presents // 10
     max_houses = min_deliveries
     logger.info(
@@ -94,18 +97,9 @@ Dublin to Belfast = 141
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -8,11 +8,11 @@ from dataclasses import dataclass
 from enum import Enum
 from itertools import product
 from math import prod
-from queue import PriorityQueue
 from typing import List, Dict, Any, Tuple
 import aocd
 from aoc_2015 import aoc_year
 from loguru import logger
+from aoc_common.search import shortest_path
 
 aoc_day = 22
 try:
@@ -185,7 +185,17 @@ def play_round(state, spell, current_best, hard_mode: bool = False):
     return state_out
 
 
-def part1(context: AOCContext):
+def state_key(state):
+    """What makes two games the same, ignoring mana_spent, which is their cost. Armor follows from the effects."""
+    return (
+        state["player"]["hit_points"],
+        state["player"]["mana"],
+        state["boss"]["hit_points"],
+        tuple(sorted((e["name"], e["timer"]) for e in state["current_effects"])),
+    )
+
+
+def least_mana_to_win(context: AOCContext, hard_mode: bool = False):
     initial_game = {
         "player": copy(context.starting_player),
         "boss": copy(context.starting_boss),
@@ -193,52 +203,31 @@ def part1(context: AOCContext):
         "mana_spent": 0,
         "current_state": GameState.ONGOING,
     }
-    game_states = PriorityQueue()
-    game_states.put((0, initial_game))
-    current_best = sys.maxsize
-    minimum_mana_spend = 53
-    while not game_states.empty():
-        (_, state) = game_states.get()
-        for spell in list(context.available_spells.values()):
-            result = play_round(state, spell, current_best)
-            if result["current_state"] == GameState.ONGOING:
-                # print(f"{result}")
-                if result["mana_spent"] + minimum_mana_spend < current_best:
-                    game_states.put((-result["mana_spent"], result))
-            elif result["current_state"] == GameState.PLAYER_WON:
-                if result["mana_spent"] < current_best:
-                    current_best = result["mana_spent"]
-        # if round == 2:
-        #     break
-    return str(current_best)
+    spells = list(context.available_spells.values())
+
+    def next_rounds(state):
+        for spell in spells:
+            result = play_round(state, spell, None, hard_mode=hard_mode)
+            if result["current_state"] in (GameState.ONGOING, GameState.PLAYER_WON):
+                yield result, result["mana_spent"] - state["mana_spent"]
+
+    # spell costs run up to 229, too sparse for a bucket queue to pay off
+    result = shortest_path(
+        initial_game,
+        next_rounds,
+        lambda state: state["current_state"] == GameState.PLAYER_WON,
+        key=state_key,
+    )
+    logger.info(f"Search {'in hard mode ' if hard_mode else ''}{result.stats}")
+    return str(result.cost)
+
+
+def part1(context: AOCContext):
+    return least_mana_to_win(context)
 
 
 def part2(context: AOCContext):
-    initial_game = {
-        "player": copy(context.starting_player),
-        "boss": copy(context.starting_boss),
-        "current_effects": [],
-        "mana_spent": 0,
-        "current_state": GameState.ONGOING,
-    }
-    game_states = PriorityQueue()
-    game_states.put((0, initial_game))
-    current_best = sys.maxsize
-    minimum_mana_spend = 53
-    while not game_states.empty():
-        (_, state) = game_states.get()
-        for spell in list(context.available_spells.values()):
-            result = play_round(state, spell, current_best, hard_mode=True)
-            if result["current_state"] == GameState.ONGOING:
-                # print(f"{result}")
-                if result["mana_spent"] + minimum_mana_spend < current_best:
-                    game_states.put((-result["mana_spent"], result))
-            elif result["current_state"] == GameState.PLAYER_WON:
-                if result["mana_spent"] < current_best:
-                    current_best = result["mana_spent"]
-        # if round == 2:
-        #     break
-    return str(current_best)
+    return least_mana_to_win(context, hard_mode=True)
 
 
 tests = [
@@ -253,18 +242,9 @@ Damage: 9
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
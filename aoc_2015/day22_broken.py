@@ -14,7 +14,7 @@ from . import aoc_year
 from loguru import logger
 import copy
 
-aoc_day = 21
+aoc_day = 22
 try:
     if __name__ != "__main__":
         assert str(aoc_day) in __name__
@@ -254,6 +254,8 @@ Damage: 9
 
 
 def test(start: int = 0, finish: int = len(tests)):
+    from aoc_runner.testing import run_module_cases
+
     # def gd(*args, **kwargs):
     #     return tests[0][0]
     # aocd.get_data = gd
@@ -274,18 +276,7 @@ def test(start: int = 0, finish: int = len(tests)):
     # checked_cast("Magic Missile")
     logger.remove()
     logger.add(sys.stderr, level="INFO")
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Tuple
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.log import log
 
 aoc_day = 23
 try:
@@ -80,11 +81,11 @@ class Computer:
 
     def run(self):
         while self.pc <= self.max_pc:
-            logger.debug(
-                f"pc: {self.pc} - a={self.registers['a']}, b={self.registers['b']}"
+            log.debug(
+                "pc: {} - a={}, b={}", self.pc, self.registers["a"], self.registers["b"]
             )
             ins, args = self.program[self.pc]
-            logger.debug(f"ins: {ins} {args}")
+            log.debug("ins: {} {}", ins, args)
             if ins == "hlf":
                 r = args[0]
                 self.registers[r] = self.registers[r] // 2
@@ -146,18 +147,9 @@ Dublin to Belfast = 141
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
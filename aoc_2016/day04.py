@@ -133,23 +133,14 @@ totally-real-room-200[decoy]
 
 
 def test(start: int = 0, finish: int = len(tests)):
+    from aoc_runner.testing import run_module_cases
+
     print(
         decrypt_room_name(
             Room(encrypted_name="qzmt-zixmtkozy-ivhz", sector_id=343, checksum="")
         )
     )
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
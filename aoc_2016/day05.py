@@ -3,6 +3,7 @@ import re
 import sys
 import operator
 from collections import defaultdict, namedtuple
+from contextlib import closing
 from dataclasses import dataclass
 from itertools import product
 from math import prod
@@ -11,7 +12,8 @@ import aocd
 from . import aoc_year
 from loguru import logger
 
-from _md5 import md5
+from aoc_common.log import lazy, log
+from aoc_common.md5search import HashStats, first_hits, prefix_hits
 
 aoc_day = 5
 try:
@@ -38,16 +40,6 @@ class AOCContext:
     door_id: str
 
 
-def next_digit(door_id: str, next_index: int, prefix: str = "00000"):
-    found = False
-    i = next_index
-    while not found:
-        digest = md5(f"{door_id}{i}".encode()).hexdigest()
-        i += 1
-        if digest.startswith(prefix):
-            return digest, i
-
-
 def preprocess():
     raw = aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
     door_id = raw[0].strip()
@@ -56,55 +48,47 @@ def preprocess():
 
 
 def part1(context: AOCContext):
-    password = ""
-    next_i = 0
-    for _ in range(8):
-        digest, next_i = next_digit(context.door_id, next_i)
-        c = digest[5]
-        password += c
-        logger.debug(f"password={password}")
-    return str(password)
+    # the sixth hex digit is the low nibble of the third byte
+    hits, stats = first_hits(context.door_id, "00000", 8)
+    log.info("part1: {}", stats)
+    return "".join(f"{digest[2] & 0xF:x}" for _, digest in hits)
 
 
 def part2(context: AOCContext):
-    password = "--------"
-    next_i = 0
-    while "-" in password:
-        digest, next_i = next_digit(context.door_id, next_i)
-        pos = int(digest[5], 16)
-        c = digest[6]
-        if pos < len(password) and password[pos] == "-":
-            password = password[:pos] + c + password[pos + 1 :]
-            assert len(password) == 8
-            logger.debug(f"password={password}")
-    return str(password)
+    password = ["-"] * 8
+    stats = HashStats()
+    with closing(prefix_hits(context.door_id, "00000", stats=stats)) as hits:
+        for _, digest in hits:
+            pos, c = digest[2] & 0xF, digest[3] >> 4
+            if pos < len(password) and password[pos] == "-":
+                password[pos] = f"{c:x}"
+                log.debug("password={}", lazy(lambda: "".join(password)))
+                if "-" not in password:
+                    break
+    log.info("part2: {}", stats)
+    return "".join(password)
 
 
 tests = [
     (
-        """London to Dublin = 464
-London to Belfast = 518
-Dublin to Belfast = 141
+        """abc
 """,
-        605,
+        "18f47a30",
         part1,
     ),
+    (
+        """abc
+""",
+        "05ace8e3",
+        part2,
+    ),
 ]
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ import aocd
 from advent_of_code_ocr import convert_6
 from . import aoc_year
 from loguru import logger
+from aoc_common.bitarray import BitBoard
 
 aoc_day = 8
 try:
@@ -31,22 +32,18 @@ except AssertionError:
         logger.error(f"Unable to guess a day from {__name__}. Exiting")
         sys.exit(1)
 
-Point = namedtuple("Point", "x y")
-
 
 class Screen:
     w: int
     h: int
-    # bitmap: List[List[str]]
-    pixels_on: Set[Point]
+    pixels: BitBoard
     fg_char = "#"
     bg_char = "."
 
     def __init__(self, w: int = 50, h: int = 6):
         self.w = w
         self.h = h
-        self.bitmap = []
-        self.pixels_on = set()
+        self.pixels = BitBoard(w, h)
 
     def cmd(self, command: str, *args):
         if command == "rect":
@@ -60,27 +57,16 @@ class Screen:
             self.rotate(axis, position, distance)
 
     def rect(self, w: int, h: int):
-        for y, x in product(range(h), range(w)):
-            # self.bitmap[y][x] = "#"
-            self.pixels_on.add(Point(x, y))
+        self.pixels.fill(0, 0, w, h)
 
     def rotate(self, axis: str, position: int, distance: int):
-        rotated_line = set()
-        for p in set(filter(lambda pp: getattr(pp, axis) == position, self.pixels_on)):
-            self.pixels_on.remove(p)
-            if axis == "x":
-                rotated_line.add(Point(p.x, (p.y + distance) % self.h))
-            elif axis == "y":
-                rotated_line.add(Point((p.x + distance) % self.w, p.y))
-        self.pixels_on |= rotated_line
+        if axis == "x":
+            self.pixels.rotate_column(position, distance)
+        elif axis == "y":
+            self.pixels.rotate_row(position, distance)
 
     def __str__(self):
-        bitmap = []
-        for _ in range(self.h):
-            bitmap.append(list(f"{self.bg_char}" * self.w))
-        for p in self.pixels_on:
-            bitmap[p.y][p.x] = self.fg_char
-        return "\n".join(["".join(row) for row in bitmap])
+        return self.pixels.render(one=self.fg_char, zero=self.bg_char)
 
 
 @dataclass
@@ -113,31 +99,20 @@ def part1(context: AOCContext):
     for command in context.commands:
         screen.cmd(command[0], *command[1])
     print(screen)
-    return str(len(screen.pixels_on))
+    return str(screen.pixels.count())
 
 
-def get_letter_bitmap(points: Set[Point], index: int):
-    min_x = index * 5
-    max_x = index * 5 + 4
-    max_y = max(p.y for p in points)
-    lines = []
-    for y in range(max_y + 1):
-        line = []
-        for x in range(min_x, max_x + 1):
-            if Point(x, y) in points:
-                line.append("#")
-            else:
-                line.append(".")
-        lines.append("".join(line))
-    return "\n".join(lines)
+def get_letter_bitmap(screen: Screen, index: int):
+    return "\n".join(
+        line[index * 5 : index * 5 + 5] for line in str(screen).splitlines()
+    )
 
 
 def recognize_letters(screen):
     n_letters = screen.w // 5  # from the puzzle
-    points = screen.pixels_on
     found_letters = []
     for i in range(n_letters):
-        bitmap = get_letter_bitmap(points, i)
+        bitmap = get_letter_bitmap(screen, i)
         found_letters.append(convert_6(bitmap))
     return "".join(found_letters)
 
@@ -165,32 +140,16 @@ rotate column x=1 by 1
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    test = tests[0]
-
-    def gd(*args, **kwargs):
-        return test[0]
+    from aoc_runner.days import input_override
 
-    aocd.get_data = gd
-    ctx = preprocess()
+    with input_override(tests[0][0]):
+        ctx = preprocess()
     screen = Screen(w=7, h=3)
     print(screen)
     for cmd in ctx.commands:
         screen.cmd(cmd[0], *cmd[1])
         print(f"After command {cmd[0]}")
         print(screen)
-    return
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
 
 
 if __name__ == "__main__":
@@ -1,17 +1,27 @@
+import random
 from typing import List
-import aocd
+from aoc_common.inputs import input_lines
 from . import aoc_year
 
 aoc_day = 1
 
 
 def preprocess():
-    measurements = [
-        int(item) for item in aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
-    ]
+    measurements = [int(item) for item in input_lines(day=aoc_day, year=aoc_year)]
     return measurements
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale depth readings from a random walk that trends deeper, like the real sonar sweep."""
+    rng = random.Random(seed)
+    depth = rng.randint(100, 200)
+    readings = []
+    for _ in range(scale):
+        depth = max(0, depth + rng.randint(-8, 12))
+        readings.append(f"{depth}\n")
+    return "".join(readings)
+
+
 def count_increases(measurements: List[int], interval: int = 1):
     return sum(b > a for a, b in zip(measurements, measurements[interval:]))
 
@@ -1,9 +1,11 @@
+import random
 from dataclasses import dataclass
 from math import prod
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.inputs import input_lines
 
 from collections import defaultdict
 
@@ -11,7 +13,29 @@ aoc_day = 2
 
 
 def preprocess():
-    return aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
+    plan = []
+    for line in input_lines(day=aoc_day, year=aoc_year):
+        direction, magnitude = line.split(" ")
+        plan.append((direction, int(magnitude)))
+    return plan
+
+
+def generate(scale: int, seed: int = 0) -> str:
+    """scale course commands, never steering the sub above the surface."""
+    rng = random.Random(seed)
+    depth = 0
+    lines = []
+    for _ in range(scale):
+        direction = rng.choice(("forward", "forward", "down", "up"))
+        magnitude = rng.randint(1, 9)
+        if direction == "up":
+            if depth == 0:
+                direction = "down"
+            else:
+                magnitude = min(magnitude, depth)
+        depth += {"down": magnitude, "up": -magnitude}.get(direction, 0)
+        lines.append(f"{direction} {magnitude}\n")
+    return "".join(lines)
 
 
 @dataclass
@@ -21,11 +45,9 @@ class Position:
     aim: int
 
 
-def part1(plan: List[str]):
+def part1(plan: List[Tuple[str, int]]):
     pos = Position(0, 0, 0)
-    for step in plan:
-        direction, magnitude = step.split(" ")
-        magnitude = int(magnitude)
+    for direction, magnitude in plan:
         if direction == "forward":
             pos.horizontal += magnitude
         elif direction == "down":
@@ -35,11 +57,9 @@ def part1(plan: List[str]):
     return str(pos.horizontal * pos.depth)
 
 
-def part2(plan: List[str]):
+def part2(plan: List[Tuple[str, int]]):
     pos = Position(0, 0, 0)
-    for step in plan:
-        direction, magnitude = step.split(" ")
-        magnitude = int(magnitude)
+    for direction, magnitude in plan:
         if direction == "forward":
             pos.horizontal += magnitude
             pos.depth += pos.aim * magnitude
@@ -77,18 +97,9 @@ forward 2
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
+import random
 from dataclasses import dataclass
 from math import prod
 from typing import List, Dict
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.inputs import input_lines
 
 from collections import defaultdict
 
@@ -11,7 +13,37 @@ aoc_day = 3
 
 
 def preprocess():
-    return aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
+    return list(input_lines(day=aoc_day, year=aoc_year))
+
+
+def _co2_rating_exists(values: List[int], width: int) -> bool:
+    # The oxygen filter always keeps the bit some values have, but the CO2 filter keeps the less common bit, which
+    # is the missing one when every remaining value agrees on a column. Then nothing is left.
+    remaining = values
+    for col in reversed(range(width)):
+        if len(remaining) == 1:
+            return True
+        ones = [v for v in remaining if v >> col & 1]
+        zeros = [v for v in remaining if not v >> col & 1]
+        if not ones or not zeros:
+            return False
+        remaining = zeros if len(zeros) <= len(ones) else ones
+    return len(remaining) == 1
+
+
+def generate(scale: int, seed: int = 0) -> str:
+    """scale distinct diagnostic report lines, at least 2, of 12 bits or as many more as scale needs.
+
+    Samples are redrawn until part 2's CO2 filter narrows to one line, like real reports do.
+    """
+    if scale < 2:
+        raise ValueError("A diagnostic report needs at least 2 lines for part 2")
+    rng = random.Random(seed)
+    width = max(12, (scale - 1).bit_length())
+    while True:
+        values = rng.sample(range(1 << width), scale)
+        if _co2_rating_exists(values, width):
+            return "".join(f"{v:0{width}b}\n" for v in values)
 
 
 def min_key(frequency_dict: dict):
@@ -112,18 +144,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import random
 import sys
 from dataclasses import dataclass
 from math import prod
@@ -56,6 +57,20 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale 5x5 bingo cards. Every number on a card is drawn eventually, so every card wins."""
+    rng = random.Random(seed)
+    numbers = list(range(max(100, 2 * scale)))
+    rng.shuffle(numbers)
+    chunks = [",".join(str(n) for n in numbers), ""]
+    for _ in range(scale):
+        card = rng.sample(numbers, 25)
+        for r in range(5):
+            chunks.append(" ".join(f"{n:>2}" for n in card[r * 5 : r * 5 + 5]))
+        chunks.append("")
+    return "\n".join(chunks)
+
+
 def score_card(card: List):
     score = 0
     for row in card:
@@ -182,18 +197,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import random
 import sys
 from dataclasses import dataclass
 from functools import cache
@@ -6,6 +7,8 @@ from typing import List, Dict, Any, Tuple
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.inputs import input_chunks
+from aoc_common.parse import ints
 
 from collections import defaultdict, OrderedDict
 
@@ -40,18 +43,32 @@ def points(
 
 
 def preprocess():
-    context = {"raw": aocd.get_data(day=aoc_day, year=aoc_year).splitlines()}
-    segments: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
-    for line in context["raw"]:
-        ss, es = line.strip().split(" -> ")
-        x1, y1 = ss.split(",")
-        start = (int(x1), int(y1))
-        x2, y2 = es.split(",")
-        end = (int(x2), int(y2))
-        segments.append((start, end))
-
-    context["segments"] = segments
-    return context
+    # one row of x1, y1, x2, y2 per segment
+    segments = ints(input_chunks(day=aoc_day, year=aoc_year), columns=4)
+    return {"segments": segments}
+
+
+def generate(scale: int, seed: int = 0) -> str:
+    """scale vent segments on a 1000x1000 floor, each horizontal, vertical or at 45 degrees."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(scale):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(1000), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(1000)
+        else:
+            dx, dy = rng.choice((-1, 1)), rng.choice((-1, 1))
+            room = min(
+                x1 if dx < 0 else 999 - x1,
+                y1 if dy < 0 else 999 - y1,
+            )
+            length = rng.randint(0, room)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        lines.append(f"{x1},{y1} -> {x2},{y2}\n")
+    return "".join(lines)
 
 
 def print_board(hits):
@@ -64,8 +81,8 @@ def print_board(hits):
 
 def part1(context: Dict[str, Any]):
     hits: Dict[Tuple[int, int], int] = defaultdict(int)
-    for s in context["segments"]:
-        for p in points(s[0], s[1]):
+    for x1, y1, x2, y2 in context["segments"].tolist():
+        for p in points((x1, y1), (x2, y2)):
             hits[p] += 1
     danger = sum(hits[h] >= 2 for h in hits.keys())
     return str(danger)
@@ -73,8 +90,8 @@ def part1(context: Dict[str, Any]):
 
 def part2(context: Dict[str, Any]):
     hits: Dict[Tuple[int, int], int] = defaultdict(int)
-    for s in context["segments"]:
-        for p in points(s[0], s[1], include_diagonal=True):
+    for x1, y1, x2, y2 in context["segments"].tolist():
+        for p in points((x1, y1), (x2, y2), include_diagonal=True):
             hits[p] += 1
     danger = sum(hits[h] >= 2 for h in hits.keys())
     return str(danger)
@@ -115,18 +132,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if result != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
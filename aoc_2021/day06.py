@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 from collections import defaultdict, namedtuple, Counter
 from dataclasses import dataclass
@@ -27,6 +28,12 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale lanternfish timers, all between 1 and 5 like the real input."""
+    rng = random.Random(seed)
+    return ",".join(str(rng.randint(1, 5)) for _ in range(scale)) + "\n"
+
+
 def process_day(fish: Dict[int, int]):
     next_fish = defaultdict(int)
     for age, count in fish.items():
@@ -66,18 +73,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 from collections import defaultdict, namedtuple
 from dataclasses import dataclass
@@ -25,6 +26,15 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale crab positions spread over 0..2*scale, always including both ends of that range."""
+    rng = random.Random(seed)
+    top = max(2, 2 * scale)
+    positions = [0, top] + [rng.randint(0, top) for _ in range(max(0, scale - 2))]
+    rng.shuffle(positions)
+    return ",".join(str(p) for p in positions) + "\n"
+
+
 def part1(context: AOCContext):
     crab_positions = sorted(context.positions)
     logger.info(
@@ -72,18 +82,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -8,8 +9,11 @@ from itertools import product
 from math import prod
 from typing import List, Dict, Any, Tuple, Set
 import aocd
+import numpy as np
 from . import aoc_year
 from loguru import logger
+from aoc_common.grid import Grid
+from aoc_common.log import lazy, log
 
 aoc_day = 9
 try:
@@ -33,76 +37,65 @@ except AssertionError:
 @dataclass
 class AOCContext:
     raw: List[str]
-    height_map: List[List[int]]
-    map_w: int
-    map_h: int
+    height_map: Grid
 
 
 def preprocess():
     raw = aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
-    height_map = []
-    for line in raw:
-        line = line.strip()
-        height_map.append([int(x) for x in list(line)])
-    map_w = len(height_map[0])
-    map_h = len(height_map)
-    context = AOCContext(raw, height_map, map_w, map_h)
+    # padding with 9s walls off the edges for basins, and no 9 is ever a low point
+    height_map = Grid.from_digits(raw, pad_value=9)
+    context = AOCContext(raw, height_map)
     return context
 
 
-def neighbors(context: AOCContext, x: int, y: int):
-    if y > 0:
-        yield (x, y - 1), context.height_map[y - 1][x]
-    if y < context.map_h - 1:
-        yield (x, y + 1), context.height_map[y + 1][x]
-    if x > 0:
-        yield (x - 1, y), context.height_map[y][x - 1]
-    if x < context.map_w - 1:
-        yield (x + 1, y), context.height_map[y][x + 1]
-
-
-def basin(
-    context: AOCContext, x: int, y: int, visited: Set[Tuple[Tuple[int, int], int]]
-):
-    basin_points = [((x, y), context.height_map[y][x])]
-    for neighbor in neighbors(context, x, y):
-        if neighbor[1] < 9:
-            basin_points.append(neighbor)
-            if neighbor not in visited:
-                visited.add(neighbor)
-                basin_points.extend(
-                    basin(context, neighbor[0][0], neighbor[0][1], visited)
-                )
-    return set(basin_points)
-
-
-def low_points(context: AOCContext):
-    points = []
-    for y in range(context.map_h):
-        for x in range(context.map_w):
-            test_point = context.height_map[y][x]
-            if all(test_point < p[1] for p in neighbors(context, x, y)):
-                logger.debug(
-                    f"test_point({x},{y})={test_point} < all neighbors: {list(neighbors(context, x, y))}"
-                )
-                points.append(((x, y), test_point))
+def generate(scale: int, seed: int = 0) -> str:
+    """A scale x scale height map, walled into small basins by ridges of 9s."""
+    rng = random.Random(seed)
+    rows = []
+    for y in range(scale):
+        row = []
+        for x in range(scale):
+            if x % 8 == 7 or y % 6 == 5 or rng.random() < 0.1:
+                row.append("9")
+            else:
+                row.append(str(rng.randint(0, 8)))
+        rows.append("".join(row) + "\n")
+    return "".join(rows)
+
+
+def basin_size(heights: List[int], table: List[List[int]], start: int):
+    seen = {start}
+    stack = [start]
+    while stack:
+        for n in table[stack.pop()]:
+            if n not in seen and heights[n] < 9:
+                seen.add(n)
+                stack.append(n)
+    return len(seen)
+
+
+def low_points(height_map: Grid) -> np.ndarray:
+    """Flat indices of the cells lower than all four of their neighbors."""
+    low = (height_map.values < height_map.neighbor_min()).ravel()
+    points = height_map.interior()[low]
+    log.debug("low points: {}", lazy(lambda: [height_map.point(i) for i in points]))
     return points
 
 
 def part1(context: AOCContext):
-    lowest_points = low_points(context)
-    risk_level = sum(p[1] + 1 for p in lowest_points)
-    logger.debug(f"low_points: {lowest_points}")
+    lowest_points = low_points(context.height_map)
+    risk_level = int(context.height_map.flat[lowest_points].sum()) + len(lowest_points)
     return str(risk_level)
 
 
 def part2(context: AOCContext):
-    basins = []
-    lowest_points = low_points(context)
-    for p in lowest_points:
-        basins.append(list(basin(context, p[0][0], p[0][1], set())))
-    logger.debug(f"found {len(basins)}")
-    basin_sizes = sorted([len(b) for b in basins])
+    height_map = context.height_map
+    heights = height_map.flat.tolist()
+    table = height_map.neighbor_table(4).tolist()
+    basin_sizes = sorted(
+        basin_size(heights, table, p) for p in low_points(height_map).tolist()
+    )
+    log.debug("found {}", len(basin_sizes))
     return str(prod(basin_sizes[-3:]))
 
 
@@ -131,18 +124,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
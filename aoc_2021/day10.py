@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -10,6 +11,7 @@ from typing import List, Dict, Any, Tuple
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.inputs import input_lines
 
 aoc_day = 10
 try:
@@ -81,7 +83,7 @@ class SyntaxChecker:
 
 
 def preprocess():
-    raw = aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
+    raw = list(input_lines(day=aoc_day, year=aoc_year))
     scoring_table = {
         ")": 3,
         "]": 57,
@@ -92,6 +94,32 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale lines of navigation subsystem brackets, each either corrupted or incomplete."""
+    rng = random.Random(seed)
+    pairs = list(matching_characters.items())
+    lines = []
+    for i in range(scale):
+        line = []
+        stack = []
+        length = rng.randint(20, 110)
+        while len(line) < length:
+            if stack and rng.random() < 0.45:
+                line.append(stack.pop())
+            else:
+                opening, closing = rng.choice(pairs)
+                line.append(opening)
+                stack.append(closing)
+        if stack and rng.random() < 0.5:
+            # corrupt it with a closing character that doesn't match
+            line.append(rng.choice([c for _, c in pairs if c != stack[-1]]))
+        elif not stack:
+            opening, closing = rng.choice(pairs)
+            line.append(opening)
+        lines.append("".join(line) + "\n")
+    return "".join(lines)
+
+
 def part1(context: AOCContext):
     checker = SyntaxChecker(context)
     checker.check_input()
@@ -152,18 +180,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
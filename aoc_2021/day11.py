@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -7,10 +8,13 @@ from dataclasses import dataclass
 from functools import cache
 from itertools import product
 from math import prod
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Optional, Tuple, Set
 import aocd
+import numpy as np
 from . import aoc_year
 from loguru import logger
+from aoc_common.grid import Grid
+from aoc_common.log import lazy, log
 
 aoc_day = 11
 try:
@@ -39,59 +43,25 @@ class AOCContext:
 
 class OctopusSwarm:
     def __init__(self, context: AOCContext):
-        self.grid = []
-        for line in context.raw:
-            self.grid.append([int(x) for x in list(line)])
-        self.grid_w = len(self.grid[0])
-        self.grid_h = len(self.grid)
+        self.grid = Grid.from_digits(context.raw)
+        # flashes in the current step, padded with False so edge octopuses only count real neighbors
+        self.flashing = Grid(np.zeros((self.grid.h, self.grid.w), dtype=bool), False)
         self.steps = 0
 
-    def find_neighbors(self, x: int, y: int):
-        if x > 0:
-            yield x - 1, y
-            if y > 0:
-                yield x - 1, y - 1
-            if y < self.grid_h - 1:
-                yield x - 1, y + 1
-        if x < self.grid_w - 1:
-            yield x + 1, y
-            if y > 0:
-                yield x + 1, y - 1
-            if y < self.grid_h - 1:
-                yield x + 1, y + 1
-        if y > 0:
-            yield x, y - 1
-        if y < self.grid_h - 1:
-            yield x, y + 1
-
-    def increment_all(self):
-        # this might argue for numpy if runtimes get long
-        for y, row in enumerate(self.grid):
-            row = [v + 1 for v in row]
-            self.grid[y] = row
-
-    def flash(self, x, y, flashed: Set[Tuple[int, int]]):
-        self.grid[y][x] = 0
-        flashed.add((x, y))
-        for nx, ny in self.find_neighbors(x, y):
-            if (nx, ny) not in flashed:
-                self.grid[ny][nx] += 1
-                if self.grid[ny][nx] >= 10:
-                    self.flash(nx, ny, flashed)
-
     def step(self):
         self.steps += 1
-        flashed = set()
-        self.increment_all()
-        round_flashed = -1
-        while round_flashed != 0:
-            round_flashed = len(flashed)
-            for y, row in enumerate(self.grid):
-                for x, col in enumerate(row):
-                    if col >= 10:
-                        self.flash(x, y, flashed)
-            round_flashed = len(flashed) - round_flashed
-        return len(flashed)
+        energy = self.grid.values
+        flashed = np.zeros_like(self.flashing.values)
+        energy += 1
+        while True:
+            new = (energy > 9) & ~flashed
+            if not new.any():
+                break
+            flashed |= new
+            self.flashing.values[...] = new
+            energy += self.flashing.neighbor_sum(8, dtype=energy.dtype)
+        energy[flashed] = 0
+        return int(flashed.sum())
 
 
 def preprocess():
@@ -100,14 +70,45 @@ def preprocess():
     return context
 
 
+def synchronizes(raw: List[str], limit: int) -> Optional[int]:
+    """The first step where every octopus flashes at once, if there is one within limit steps."""
+    swarm = OctopusSwarm(AOCContext(raw))
+    size = swarm.grid.h * swarm.grid.w
+    while swarm.steps < limit:
+        if swarm.step() == size:
+            return swarm.steps
+    return None
+
+
+def generate(scale: int, seed: int = 0) -> str:
+    """A grid of octopus energy levels scale wide, rounded up to a multiple of 10.
+
+    Random grids bigger than 10x10 almost never synchronize, so the grid is a random 10x10 block repeated to size.
+    Blocks are drawn until the whole grid first synchronizes after step 100, as part 2 assumes, and within 1000
+    steps. Some blocks stop synchronizing once repeated, so the check is on the full grid.
+    """
+    rng = random.Random(seed)
+    k = max(1, -(-scale // 10))
+    while True:
+        block = ["".join(str(rng.randint(0, 9)) for _ in range(10)) for _ in range(10)]
+        # most blocks fail alone or repeated 3x3, which is much cheaper to find out than at full size
+        if not all(
+            synchronizes([row * n for row in block] * n, 1000) for n in {1, min(k, 3)}
+        ):
+            continue
+        raw = [row * k for row in block] * k
+        step = synchronizes(raw, 1000)
+        if step is not None and step > 100:
+            return "\n".join(raw) + "\n"
+
+
 def part1(context: AOCContext):
     swarm = OctopusSwarm(context)
     total_flashes = 0
     for i in range(100):
         flashes = swarm.step()
-        logger.debug(f"Round {i+1}: {flashes} flashed")
-        for row in swarm.grid:
-            logger.debug("".join(str(c) for c in row))
+        log.debug("Round {}: {} flashed", i + 1, flashes)
+        log.debug("{}", lazy(swarm.grid.render))
         total_flashes += flashes
     context.swarm = swarm
     return str(total_flashes)
@@ -115,8 +116,9 @@ def part1(context: AOCContext):
 
 def part2(context: AOCContext):
     swarm = context.swarm or OctopusSwarm(context)
+    size = swarm.grid.h * swarm.grid.w
     flashes = 0
-    while flashes < 100:
+    while flashes < size:
         flashes = swarm.step()
     return str(swarm.steps)
 
@@ -141,18 +143,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -12,6 +13,7 @@ import aocd
 from advent_of_code_ocr import convert_6
 from . import aoc_year
 from loguru import logger
+from aoc_common.parse import ints
 
 aoc_day = 13
 try:
@@ -42,17 +44,12 @@ class AOCContext:
 
 
 def preprocess():
-    raw = aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
-    visible_dots = set()
-    fl = 0
+    text = aocd.get_data(day=aoc_day, year=aoc_year)
+    dot_text, _, fold_text = text.partition("\n\n")
+    raw = text.splitlines()
+    visible_dots = set(map(Point._make, ints(dot_text, columns=2).tolist()))
     folds = []
-    for i, line in enumerate(raw):
-        if not line:
-            fl = i + 1
-            break
-        x, y = line.split(",")
-        visible_dots.add(Point(int(x), int(y)))
-    for line in raw[fl:]:
+    for line in fold_text.splitlines():
         axis, location = line.split("=")
         axis = axis.split()
         axis = axis[-1]
@@ -62,6 +59,49 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """Roughly scale dots that fold up into eight random letters.
+
+    This works backwards from the answer. Each unfold mirrors the sheet across a line past its edge, and every dot
+    lands on one side of the line or both. Unfolding stops once there are at least scale dots.
+    """
+    from advent_of_code_ocr.characters import ALPHABET_6
+
+    rng = random.Random(seed)
+    glyphs = {letter: bitmap for bitmap, letter in ALPHABET_6.items()}
+    dots = set()
+    for i, letter in enumerate(rng.choices(sorted(glyphs), k=8)):
+        for y, row in enumerate(glyphs[letter].split("\n")):
+            dots.update(Point(i * 5 + x, y) for x, c in enumerate(row) if c == "#")
+    width, height = 40, 6
+    folds = []
+    while len(dots) < scale or not folds:
+        axis = "x" if len(folds) % 2 == 0 else "y"
+        line = width if axis == "x" else height
+        unfolded = set()
+        for dot in dots:
+            mirrored = (
+                Point(2 * line - dot.x, dot.y)
+                if axis == "x"
+                else Point(dot.x, 2 * line - dot.y)
+            )
+            side = rng.randrange(3)
+            if side != 1:
+                unfolded.add(dot)
+            if side != 0:
+                unfolded.add(mirrored)
+        dots = unfolded
+        folds.append(f"fold along {axis}={line}")
+        if axis == "x":
+            width = 2 * line + 1
+        else:
+            height = 2 * line + 1
+    shuffled = sorted(dots)
+    rng.shuffle(shuffled)
+    lines = [f"{d.x},{d.y}" for d in shuffled] + [""] + folds[::-1]
+    return "\n".join(lines) + "\n"
+
+
 def fold(visible_dots: Set[Point], direction: str, location: int):
     updated_visible_dots = visible_dots.copy()
     past_the_fold = set(
@@ -189,18 +229,9 @@ fold along x=5
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
+    from aoc_runner.testing import run_module_cases
 
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -10,6 +11,7 @@ from typing import List, Dict, Any, Tuple
 import aocd
 from . import aoc_year
 from loguru import logger
+from aoc_common.log import lazy, log
 
 aoc_day = 10
 try:
@@ -48,6 +50,15 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """A polymer template scale elements long, with an insertion rule for every pair of ten elements."""
+    rng = random.Random(seed)
+    elements = rng.sample("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 10)
+    template = "".join(rng.choice(elements) for _ in range(max(2, scale)))
+    rules = [f"{a}{b} -> {rng.choice(elements)}" for a in elements for b in elements]
+    return "\n".join([template, ""] + rules) + "\n"
+
+
 def part1(context: AOCContext):
     polymer = context.template
     for i in range(10):
@@ -59,8 +70,11 @@ def part1(context: AOCContext):
                 if pair in context.rules:
                     new_polymer += context.rules[pair]
         polymer = new_polymer
-        logger.debug(
-            f"After step {i+1}: len={len(polymer)} - {polymer[:min(100,len(polymer))]}"
+        log.debug(
+            "After step {}: len={} - {}",
+            i + 1,
+            len(polymer),
+            lazy(lambda: polymer[:100]),
         )
     counter = Counter(list(polymer))
     frequencies = counter.most_common()
@@ -89,7 +103,7 @@ def part2(context: AOCContext):
                 new_pair_counts[c + p[1]] += pair_counts[p]
             else:
                 new_pair_counts[p] += pair_counts[p]
-        logger.debug(f"after {i+1}: {new_pair_counts}")
+        log.debug("after {}: {}", i + 1, new_pair_counts)
         # logger.debug(f"{pairs_to_elements(new_pair_counts)}")
         pair_counts = new_pair_counts.copy()
 
@@ -153,18 +167,9 @@ CN -> C
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-
-        def gd(*args, **kwargs):
-            return t[0]
-
-        aocd.get_data = gd
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import random
 import re
 import sys
 from dataclasses import dataclass
@@ -147,6 +148,52 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """A BITS transmission of about scale packets, nested no deeper than 16 levels."""
+    rng = random.Random(seed)
+
+    def literal():
+        value = rng.getrandbits(rng.randint(1, 12))
+        groups = f"{value:b}"
+        groups = groups.zfill(-(-len(groups) // 4) * 4)
+        chunks = [groups[i : i + 4] for i in range(0, len(groups), 4)]
+        body = "".join(
+            ("1" if i < len(chunks) - 1 else "0") + c for i, c in enumerate(chunks)
+        )
+        return f"{rng.randrange(8):03b}100{body}"
+
+    def packet(budget, depth):
+        if budget <= 1 or depth >= 16:
+            return literal(), 1
+        # a sum at the root, so part 2 isn't just the 0 or 1 of a comparison
+        type_id = 0 if depth == 0 else rng.choice((0, 1, 2, 3, 5, 6, 7))
+        if type_id >= 5:
+            wanted = 2
+        else:
+            wanted = min(budget - 1, rng.randint(1, 8), 2047)
+        bits = []
+        used = 1
+        for i in range(wanted):
+            share = max(1, (budget - used) // (wanted - i))
+            if type_id >= 5:
+                # keep comparisons cheap so the sums and products dominate
+                share = min(share, 3)
+            sub, count = packet(share, depth + 1)
+            bits.append(sub)
+            used += count
+        body = "".join(bits)
+        header = f"{rng.randrange(8):03b}{type_id:03b}"
+        if len(body) < 2**15 and rng.random() < 0.5:
+            return f"{header}0{len(body):015b}{body}", used
+        return f"{header}1{len(bits):011b}{body}", used
+
+    bits, _ = packet(scale, 0)
+    bits += "0" * (-len(bits) % 4)
+    return (
+        "".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4)) + "\n"
+    )
+
+
 def flatten(pkt: Packet):
     packet_list = [pkt]
     if pkt.sub_packets:
@@ -183,25 +230,21 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    aocd.get_data = lambda *_, **__: "38006F45291200\n"
-    ctx = preprocess()
+    from aoc_runner.days import input_override
+    from aoc_runner.testing import run_module_cases
+
+    with input_override("38006F45291200\n"):
+        ctx = preprocess()
     pkt = make_packet(ctx.bitstream)
     logger.debug(f"subpackets: {len(pkt.sub_packets)}")
     assert len(pkt.sub_packets) == 2
-    aocd.get_data = lambda *_, **__: "EE00D40C823060\n"
-    ctx = preprocess()
+    with input_override("EE00D40C823060\n"):
+        ctx = preprocess()
     pkt = make_packet(ctx.bitstream)
     logger.debug(f"subpackets: {len(pkt.sub_packets)}")
     assert len(pkt.sub_packets) == 3
 
-    for i, t in enumerate(tests[start:finish]):
-        aocd.get_data = lambda *_, **__: t[0]
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
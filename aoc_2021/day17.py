@@ -1,3 +1,4 @@
+import random
 import re
 import sys
 from collections import namedtuple
@@ -8,6 +9,7 @@ from typing import List, Tuple, Set
 import aocd
 from loguru import logger
 
+from aoc_common.parse import ints
 from . import aoc_year
 
 aoc_day = 17
@@ -41,12 +43,7 @@ class AOCContext:
 
 def preprocess():
     raw = aocd.get_data(day=aoc_day, year=aoc_year).splitlines()
-    min_x, max_x, min_y, max_y = map(
-        int,
-        re.match(
-            r"target area: x=(-?\d+?)..(-?\d+?), y=(-?\d+?)..(-?\d+?)$", raw[0]
-        ).groups(),
-    )
+    min_x, max_x, min_y, max_y = ints(raw[0]).tolist()
     hit_points = set()
     for p in product(range(min_x, max_x + 1), range(min_y, max_y + 1)):
         hit_points.add(Point(*p))
@@ -54,6 +51,15 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """A target area about scale units from the launcher, and scale/2 units across in each direction."""
+    rng = random.Random(seed)
+    scale = max(4, scale)
+    min_x = rng.randint(scale, 2 * scale)
+    min_y = -rng.randint(scale, 2 * scale)
+    return f"target area: x={min_x}..{min_x + scale // 2}, y={min_y}..{min_y + scale // 2}\n"
+
+
 def part1(context: AOCContext):
     start = context.start_point
     min_y, max_y = min(p.y for p in context.hit_points), max(
@@ -101,14 +107,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-        aocd.get_data = lambda *_, **__: t[0]
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
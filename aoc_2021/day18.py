@@ -2,6 +2,7 @@ import ast
 import itertools
 import math
 import operator
+import random
 import re
 import sys
 from dataclasses import dataclass
@@ -126,6 +127,18 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """scale reduced snailfish numbers, mostly nested the full four levels deep."""
+    rng = random.Random(seed)
+
+    def number(depth):
+        if depth == 4 or (depth > 0 and rng.random() < 0.15):
+            return rng.randint(0, 9)
+        return [number(depth + 1), number(depth + 1)]
+
+    return "".join(f"{number(0)}\n".replace(" ", "") for _ in range(scale))
+
+
 def part1(context: AOCContext):
     snailfish_sum = reduce(operator.add, context.snailfish_numbers)
     return str(snailfish_sum.magnitude())
@@ -240,14 +253,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-        aocd.get_data = lambda *_, **__: t[0]
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,22 @@
 import itertools
+import random
 import re
 import sys
-import numpy
 import operator
 from collections import defaultdict, namedtuple
 from dataclasses import dataclass
+from functools import cache
 from math import prod
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
 import aocd
-from numpy.typing import ArrayLike
 
 from . import aoc_year
 from loguru import logger
+from aoc_common.parse import ints
+from aoc_common.trace import span
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
 
 aoc_day = 19
 try:
@@ -34,29 +39,37 @@ except AssertionError:
 # Using numpy because I think brute force will work if I do, so I won't have to look up how to do this right using
 # matrix math. I suspect that even if I need to, numpy will make it easier.
 x, y, z = 1, 2, 3
-axes = [numpy.array(combo) for combo in itertools.permutations([x, y, z])]
-rotations = [
-    numpy.array(direction) for direction in itertools.product([-1, 1], [-1, 1], [-1, 1])
-]
+
+
+@cache
+def orientations():
+    import numpy
+
+    axes = [numpy.array(combo) for combo in itertools.permutations([x, y, z])]
+    rotations = [
+        numpy.array(direction)
+        for direction in itertools.product([-1, 1], [-1, 1], [-1, 1])
+    ]
+    return list(itertools.product(axes, rotations))
 
 
 class Scanner:
     id: int
-    beacons: ArrayLike
-    location: ArrayLike
+    beacons: "ArrayLike"
+    location: "ArrayLike"
 
     def __init__(self, chunk):
-        lines = chunk.split("\n")
-        self.id = int(re.match(r"--- scanner (\d+?) ---", lines[0]).group(1))
-        if not lines[-1]:
-            lines.pop()
-        points = [[int(n) for n in line.split(",")] for line in lines[1:]]
-        self.beacons = numpy.array(points)
+        # the header's scanner number comes first
+        values = ints(chunk)
+        self.id = int(values[0])
+        self.beacons = values[1:].reshape(-1, 3)
         self.location = None
 
     def try_align(self, other: "Scanner"):
+        import numpy
+
         assert other.location is None
-        for axis, rotation in [(a, r) for a, r in itertools.product(axes, rotations)]:
+        for axis, rotation in orientations():
             r_other_beacons = other.beacons[:, axis - 1] * rotation
             differences = (
                 self.beacons[numpy.newaxis, :] - r_other_beacons[:, numpy.newaxis]
@@ -89,17 +102,75 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """Reports from scale scanners, placed on a random walk so each one shares at least 12 beacons with the last.
+
+    Each report is relative to its scanner and rotated into one of the 24 orientations a scanner can face.
+    """
+    rng = random.Random(seed)
+    facings = [
+        (perm, signs)
+        for perm in itertools.permutations(range(3))
+        for signs in itertools.product((-1, 1), repeat=3)
+        # keep only proper rotations: the sign of the permutation times the flips must be positive
+        if prod(signs)
+        * (
+            -1
+            if sum(perm[i] > perm[j] for i in range(3) for j in range(i + 1, 3)) % 2
+            else 1
+        )
+        == 1
+    ]
+
+    def random_point(lo, hi):
+        return tuple(rng.randint(lo[i], hi[i]) for i in range(3))
+
+    locations = [(0, 0, 0)]
+    for _ in range(max(1, scale) - 1):
+        prev = locations[-1]
+        locations.append(tuple(c + rng.randint(-1100, 1100) for c in prev))
+    beacons = set()
+    for i, location in enumerate(locations):
+        lo = [c - 1000 for c in location]
+        hi = [c + 1000 for c in location]
+        beacons.update(random_point(lo, hi) for _ in range(13))
+        if i:
+            prev = locations[i - 1]
+            overlap_lo = [max(lo[k], prev[k] - 1000) for k in range(3)]
+            overlap_hi = [min(hi[k], prev[k] + 1000) for k in range(3)]
+            beacons.update(random_point(overlap_lo, overlap_hi) for _ in range(12))
+    chunks = []
+    for i, location in enumerate(locations):
+        perm, signs = facings[0] if i == 0 else rng.choice(facings)
+        lines = [f"--- scanner {i} ---"]
+        seen = [
+            tuple(b[k] - location[k] for k in range(3))
+            for b in beacons
+            if all(abs(b[k] - location[k]) <= 1000 for k in range(3))
+        ]
+        rng.shuffle(seen)
+        for b in seen:
+            lines.append(",".join(str(b[perm[k]] * signs[k]) for k in range(3)))
+        chunks.append("\n".join(lines))
+    return "\n\n".join(chunks) + "\n"
+
+
 def part1(context: AOCContext):
+    import numpy
+
     logger.info(f"{len(context.scanners)} scanners in input")
     # XXX *** TODO: may need to copy these depending on part 2
     context.scanners[0].location = numpy.array([0, 0, 0])
+    alignment_round = 0
     while any(scanner.location is None for scanner in context.scanners):
-        for scanner in filter(lambda ss: ss.location is None, context.scanners):
-            for candidate in filter(
-                lambda xx: xx.location is not None, context.scanners
-            ):
-                if candidate.try_align(scanner):
-                    break
+        alignment_round += 1
+        with span("alignment round", round=alignment_round):
+            for scanner in filter(lambda ss: ss.location is None, context.scanners):
+                for candidate in filter(
+                    lambda xx: xx.location is not None, context.scanners
+                ):
+                    if candidate.try_align(scanner):
+                        break
     found_beacons = set()
     for s in context.scanners:
         absolute_beacons = s.beacons + s.location
@@ -110,6 +181,8 @@ def part1(context: AOCContext):
 
 
 def part2(context: AOCContext):
+    import numpy
+
     if not context.part1:
         part1(context)
     return str(
@@ -409,14 +482,9 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
-    for i, t in enumerate(tests[start:finish]):
-        aocd.get_data = lambda *_, **__: t[0]
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    from aoc_runner.testing import run_module_cases
+
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
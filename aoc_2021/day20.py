@@ -1,4 +1,5 @@
 import itertools
+import random
 import re
 import sys
 import operator
@@ -6,12 +7,14 @@ from collections import defaultdict, namedtuple, deque
 from dataclasses import dataclass
 from itertools import product
 from math import prod
-import numpy
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
 import aocd
 from . import aoc_year
 from loguru import logger
-from .bitarray import BitArray
+from aoc_common.bitarray import BitBoard
+
+if TYPE_CHECKING:
+    import numpy as np
 
 aoc_day = 20
 try:
@@ -46,61 +49,45 @@ char_map = {
     ".": 0,
 }
 
-pixel_region = [(x, y) for y, x in product([-1, 0, 1], [-1, 0, 1])]
-
 
 class TrenchImage:
-    grid: List[BitArray]
-    enhancement_algorithm: List[str]
-    w: int
-    h: int
+    board: BitBoard
+    enhancement_algorithm: "np.ndarray"
     filler: int
 
     def __init__(self, image_lines: str, enhancment_algorithm: str):
-        image_lines = image_lines.split()
-        self.w = len(image_lines[0])
-        self.h = len(image_lines)
-        self.grid = deque([BitArray(line, one="#", zero=".") for line in image_lines])
-        self.enhancement_algorithm = [char_map[c] for c in enhancment_algorithm]
+        import numpy as np
+
+        self.board = BitBoard.from_lines(image_lines.split())
+        self.enhancement_algorithm = np.array(
+            [char_map[c] for c in enhancment_algorithm], dtype=bool
+        )
         self.filler = 0
         self.expand_border()
 
+    @property
+    def w(self):
+        return self.board.w
+
+    @property
+    def h(self):
+        return self.board.h
+
     def expand_border(self, increment: int = 1):
-        new_h = self.h + 2 * increment
-        new_w = self.w + 2 * increment
-        for row in self.grid:
-            row.expand_left(increment, self.filler)
-            row.expand_right(increment, self.filler)
-        self.grid.insert(0, BitArray(f"{self.filler}" * new_w))
-        self.grid.append(BitArray(f"{self.filler}" * new_w))
-        self.w = new_w
-        self.h = new_h
+        self.board = self.board.expand(increment, self.filler)
 
     def enhance(self):
-        def index(xx, yy):
-            bits = 0
-            for bit, (dx, dy) in enumerate(pixel_region):
-                if 0 <= xx + dx < self.w and 0 <= yy + dy < self.h:
-                    bits |= self.grid[yy + dy][xx + dx] << (8 - bit)
-                else:
-                    bits |= self.filler << (8 - bit)
-            return bits
-
-        new_grid = deque()
-        for y in range(self.h):
-            line = self.grid[y].copy()
-            for x in range(self.w):
-                line[x] = self.enhancement_algorithm[index(x, y)]
-            new_grid.append(line)
-        self.grid = new_grid
-        self.filler = self.enhancement_algorithm[int(f"{self.filler}" * 9, 2)]
+        # every pixel's 3x3 neighborhood index at once, with the infinite background beyond the edge
+        indexes = self.board.windows(self.filler)
+        self.board = BitBoard.from_array(self.enhancement_algorithm[indexes])
+        self.filler = int(self.enhancement_algorithm[511 if self.filler else 0])
         self.expand_border()
 
+    def count(self):
+        return self.board.count()
+
     def to_bitmap(self, dark: str = ".", light: str = "#"):
-        bitmap = "\n".join(str(row) for row in self.grid)
-        bitmap = bitmap.replace("1", light)
-        bitmap = bitmap.replace("0", dark)
-        return bitmap
+        return self.board.render(one=light, zero=dark)
 
 
 @dataclass
@@ -115,27 +102,36 @@ def preprocess():
     return context
 
 
+def generate(scale: int, seed: int = 0) -> str:
+    """A scale x scale image and an enhancement algorithm that, like the real one, lights the infinite background
+    on odd steps and darkens it again on even ones."""
+    rng = random.Random(seed)
+    algorithm = ["#"] + [rng.choice("#.") for _ in range(510)] + ["."]
+    image = ["".join(rng.choice("#.") for _ in range(scale)) for _ in range(scale)]
+    return "".join(algorithm) + "\n\n" + "\n".join(image) + "\n"
+
+
 def part1(context: AOCContext):
     steps = 2
     if DEBUG:
-        logger.debug(
-            f"before\n{context.image.to_bitmap()} {sum(b.count() for b in context.image.grid)}"
-        )
+        logger.debug(f"before\n{context.image.to_bitmap()} {context.image.count()}")
     for _ in range(steps):
         context.image.enhance()
         if DEBUG:
-            logger.debug(
-                f"after\n{context.image.to_bitmap()} {sum(b.count() for b in context.image.grid)}"
-            )
-    return str(sum(b.count() for b in context.image.grid))
+            logger.debug(f"after\n{context.image.to_bitmap()} {context.image.count()}")
+    return str(context.image.count())
 
 
 def part2(context: AOCContext):
     steps = 50
     for i in range(steps):
         context.image.enhance()
-    logger.info(f"{context.image.grid[0].w} bits per line")
-    return str(sum(b.count() for b in context.image.grid))
+    logger.info(f"{context.image.w} bits per line")
+    return str(context.image.count())
+
+
+# the set-of-points version this replaced
+variants = {"part1": ["day20_slow"], "part2": ["day20_slow"]}
 
 
 tests = [
@@ -155,16 +151,11 @@ tests = [
 
 
 def test(start: int = 0, finish: int = len(tests)):
+    from aoc_runner.testing import run_module_cases
+
     global DEBUG
     DEBUG = True
-    for i, t in enumerate(tests[start:finish]):
-        aocd.get_data = lambda *_, **__: t[0]
-        result = t[2](preprocess())
-        if f"{result}" != f"{t[1]}":
-            logger.error(f"Test {start + i + 1} failed: got {result}, expected {t[1]}")
-            break
-        else:
-            logger.success(f"Test {start + i + 1}: {t[1]}")
+    return run_module_cases(__name__, start, finish)
 
 
 if __name__ == "__main__":
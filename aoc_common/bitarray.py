@@ -0,0 +1,238 @@
+"""Rows of bits packed into Python ints, so whole-row logic is one int operation.
+
+BitArray is a single row. BitBoard is a rectangle of them, with column 0 in each row's highest bit, for puzzles
+that shift, fill, mask and count whole rows at a time. Per-cell neighborhoods for every column at once come from
+windows(), which unpacks the board into numpy just long enough to stack the shifted neighbors.
+"""
+
+from itertools import product
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class BitArray:
+    n: int
+    w: int
+
+    def __init__(self, bits: str = None, one: str = "1", zero: str = "0"):
+        self.n = 0
+        self.w = 1
+        if bits:
+            self.w = len(bits)
+            for i, b in enumerate(bits):
+                if b == one:
+                    self.set(i)
+                elif b == zero:
+                    pass
+                else:
+                    raise ValueError(f"{bits} is not a valid bitstring")
+
+    def set(self, pos: int):
+        self.n |= 1 << (self.w - 1 - pos)
+
+    def clear(self, pos: int):
+        self.n &= ~(1 << (self.w - 1 - pos))
+
+    def get(self, pos: int, default=None):
+        if pos >= self.w:
+            return default
+        return self.n >> (self.w - 1 - pos) & 1
+
+    def expand_right(self, count: int, fill: int = 0):
+        self.n = self.n << count
+        self.w += count
+        if fill:
+            self.n |= (1 << count) - 1
+
+    def expand_left(self, count: int, fill: int = 0):
+        self.w += count
+        if fill:
+            self.n |= ((1 << count) - 1) << (self.w - count)
+
+    def count(self):
+        return self.n.bit_count()
+
+    def copy(self):
+        ba = BitArray()
+        ba.w = self.w
+        ba.n = self.n
+        return ba
+
+    def __getitem__(self, key: int):
+        if key >= self.w:
+            raise KeyError(f"Invalid index {key} into {self.w}-bit wide array")
+        return self.get(key)
+
+    def __setitem__(self, key: int, value: int):
+        if value == 0:
+            self.clear(key)
+        else:
+            self.set(key)
+
+    def __str__(self):
+        return f"{self.n: 0{self.w + 1}b}"
+
+
+# bit 8 - i of a window index is the cell at WINDOW[i], so the top-left neighbor is the most significant bit
+WINDOW = [(dx, dy) for dy, dx in product((-1, 0, 1), (-1, 0, 1))]
+
+
+class BitBoard:
+    w: int
+    h: int
+    rows: List[int]
+
+    def __init__(self, w: int, h: int, rows: Optional[List[int]] = None):
+        self.w = w
+        self.h = h
+        self.rows = rows if rows is not None else [0] * h
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], one: str = "#") -> "BitBoard":
+        lines = list(lines)
+        table = str.maketrans(
+            {one: "1", **{c: "0" for c in set("".join(lines)) - {one}}}
+        )
+        rows = [int(line.translate(table) or "0", 2) for line in lines]
+        return cls(len(lines[0]) if lines else 0, len(lines), rows)
+
+    @classmethod
+    def from_array(cls, bits: "np.ndarray") -> "BitBoard":
+        """A board from a 2-D array of truth values, indexed [y, x]."""
+        # numpy is slow to import, so boards that never convert don't pay for it
+        import numpy as np
+
+        h, w = bits.shape
+        padded = np.zeros((h, w + (-w) % 8), dtype=bool)
+        padded[:, padded.shape[1] - w :] = bits
+        packed = np.packbits(padded, axis=1)
+        return cls(w, h, [int.from_bytes(row.tobytes(), "big") for row in packed])
+
+    def to_array(self) -> "np.ndarray":
+        """The board as a bool array indexed [y, x]."""
+        import numpy as np
+
+        width = (self.w + 7) // 8
+        raw = b"".join(row.to_bytes(width, "big") for row in self.rows)
+        bits = np.unpackbits(
+            np.frombuffer(raw, dtype=np.uint8).reshape(self.h, width), axis=1
+        )
+        return bits[:, width * 8 - self.w :].astype(bool)
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.w) - 1
+
+    def copy(self) -> "BitBoard":
+        return BitBoard(self.w, self.h, self.rows.copy())
+
+    def get(self, x: int, y: int) -> int:
+        return self.rows[y] >> (self.w - 1 - x) & 1
+
+    def set(self, x: int, y: int, value: int = 1):
+        bit = 1 << (self.w - 1 - x)
+        self.rows[y] = self.rows[y] | bit if value else self.rows[y] & ~bit
+
+    def row(self, y: int) -> BitArray:
+        row = BitArray()
+        row.w = self.w
+        row.n = self.rows[y]
+        return row
+
+    def fill(self, x: int, y: int, w: int, h: int, value: int = 1):
+        """Set or clear the w x h rectangle whose top-left corner is (x, y), a row at a time."""
+        span = ((1 << w) - 1) << (self.w - x - w)
+        for yy in range(y, y + h):
+            self.rows[yy] = self.rows[yy] | span if value else self.rows[yy] & ~span
+
+    def rotate_row(self, y: int, n: int):
+        """Move row y's bits n columns right, wrapping around."""
+        n %= self.w
+        row = self.rows[y]
+        self.rows[y] = (row >> n | row << (self.w - n)) & self.mask
+
+    def rotate_column(self, x: int, n: int):
+        """Move column x's bits n rows down, wrapping around."""
+        bit = 1 << (self.w - 1 - x)
+        column = [row & bit for row in self.rows]
+        n %= self.h
+        column = column[-n:] + column[:-n]
+        self.rows = [row & ~bit | c for row, c in zip(self.rows, column)]
+
+    def shifted(self, dx: int, dy: int, fill: int = 0) -> "BitBoard":
+        """A copy with every cell moved dx columns right and dy rows down. Cells moved in from outside are fill."""
+        mask = self.mask
+        if dx > 0:
+            edge = ((1 << dx) - 1) << (self.w - dx) if fill else 0
+            rows = [row >> dx | edge for row in self.rows]
+        elif dx < 0:
+            edge = (1 << -dx) - 1 if fill else 0
+            rows = [(row << -dx) & mask | edge for row in self.rows]
+        else:
+            rows = self.rows.copy()
+        blank = mask if fill else 0
+        if dy > 0:
+            rows = [blank] * dy + rows[: self.h - dy]
+        elif dy < 0:
+            rows = rows[-dy:] + [blank] * -dy
+        return BitBoard(self.w, self.h, rows)
+
+    def expand(self, count: int, fill: int = 0) -> "BitBoard":
+        """A copy with a border count cells wide on every side."""
+        w = self.w + 2 * count
+        side = ((1 << count) - 1) if fill else 0
+        rows = [(row | (side << self.w)) << count | side for row in self.rows]
+        blank = ((1 << w) - 1) if fill else 0
+        return BitBoard(w, self.h + 2 * count, [blank] * count + rows + [blank] * count)
+
+    def windows(self, fill: int = 0) -> "np.ndarray":
+        """Every cell's 3x3 neighborhood as a 9-bit index, read row by row from the top-left, for all cells at once.
+
+        Cells off the edge of the board read as fill.
+        """
+        import numpy as np
+
+        padded = np.pad(self.to_array().astype(np.uint16), 1, constant_values=fill)
+        indexes = np.zeros((self.h, self.w), dtype=np.uint16)
+        for i, (dx, dy) in enumerate(WINDOW):
+            indexes |= padded[1 + dy : self.h + 1 + dy, 1 + dx : self.w + 1 + dx] << (
+                8 - i
+            )
+        return indexes
+
+    def count(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def _combine(self, other: "BitBoard", op) -> "BitBoard":
+        return BitBoard(
+            self.w, self.h, [op(a, b) for a, b in zip(self.rows, other.rows)]
+        )
+
+    def __and__(self, other: "BitBoard") -> "BitBoard":
+        return self._combine(other, int.__and__)
+
+    def __or__(self, other: "BitBoard") -> "BitBoard":
+        return self._combine(other, int.__or__)
+
+    def __xor__(self, other: "BitBoard") -> "BitBoard":
+        return self._combine(other, int.__xor__)
+
+    def __invert__(self) -> "BitBoard":
+        mask = self.mask
+        return BitBoard(self.w, self.h, [row ^ mask for row in self.rows])
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and (self.w, self.h, self.rows) == (
+            other.w,
+            other.h,
+            other.rows,
+        )
+
+    def render(self, one: str = "#", zero: str = ".") -> str:
+        table = str.maketrans("01", zero + one)
+        return "\n".join(f"{row:0{self.w}b}".translate(table) for row in self.rows)
+
+    def __str__(self):
+        return self.render()
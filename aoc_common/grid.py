@@ -0,0 +1,120 @@
+"""Rectangular puzzle grids in a contiguous numpy array, with a one-cell border of padding.
+
+Every interior cell has all of its neighbors, so nothing needs a bounds check. Padding cells hold pad_value,
+which callers pick so it can't matter: 9 for a height map's basin walls, 0 for a count, False for a light.
+
+Whole-grid stencils work on shifted views of the padded array, without a Python loop over the cells:
+
+    grid = Grid.from_digits(lines, pad_value=9)
+    low = grid.values < grid.neighbor_min()
+
+Searches that walk the grid a cell at a time use flat indices into the padded array. neighbor_table() gives each
+cell's neighbors' indices as one row, and is computed once per grid shape:
+
+    table = grid.neighbor_table(4)
+    for n in table[grid.index(x, y)]:
+        ...
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+OFFSETS: Dict[int, Tuple[Tuple[int, int], ...]] = {
+    4: ((0, -1), (0, 1), (-1, 0), (1, 0)),
+    8: ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)),
+}
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(h: int, w: int, connectivity: int = 4) -> np.ndarray:
+    """For an h x w grid padded by one cell, the flat padded indices of each cell's neighbors, one row per cell.
+
+    Rows are indexed by flat padded index too. Rows for padding cells are clipped into range and meaningless,
+    which doesn't matter as long as searches never expand a padding cell.
+    """
+    stride = w + 2
+    deltas = np.array([dy * stride + dx for dx, dy in OFFSETS[connectivity]])
+    size = (h + 2) * stride
+    table = np.clip(np.arange(size)[:, None] + deltas[None, :], 0, size - 1)
+    table.flags.writeable = False
+    return table
+
+
+class Grid:
+    def __init__(self, values: np.ndarray, pad_value=0):
+        self.h, self.w = values.shape
+        self.pad_value = pad_value
+        self.padded = np.full((self.h + 2, self.w + 2), pad_value, dtype=values.dtype)
+        self.padded[1:-1, 1:-1] = values
+        self._interior: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_digits(cls, lines: Iterable[str], pad_value=0, dtype=np.int8) -> "Grid":
+        rows = [line.strip() for line in lines]
+        raw = np.frombuffer("".join(rows).encode(), dtype=np.uint8)
+        return cls((raw - ord("0")).astype(dtype).reshape(len(rows), -1), pad_value)
+
+    @classmethod
+    def from_chars(
+        cls, lines: Iterable[str], mapping: Dict[str, int], pad_value=0, dtype=np.int8
+    ) -> "Grid":
+        """mapping gives each character's value. Characters it doesn't mention are 0."""
+        rows = [line.strip() for line in lines]
+        lookup = np.zeros(256, dtype=dtype)
+        for c, v in mapping.items():
+            lookup[ord(c)] = v
+        raw = np.frombuffer("".join(rows).encode(), dtype=np.uint8)
+        return cls(lookup[raw].reshape(len(rows), -1), pad_value)
+
+    @property
+    def values(self) -> np.ndarray:
+        """The interior as a writable view, indexed [y, x]."""
+        return self.padded[1:-1, 1:-1]
+
+    @property
+    def flat(self) -> np.ndarray:
+        return self.padded.ravel()
+
+    def copy(self) -> "Grid":
+        return Grid(self.values.copy(), self.pad_value)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * (self.w + 2) + x + 1
+
+    def point(self, i: int) -> Tuple[int, int]:
+        y, x = divmod(int(i), self.w + 2)
+        return x - 1, y - 1
+
+    def interior(self) -> np.ndarray:
+        """Flat padded indices of the interior cells, in row-major order."""
+        if self._interior is None:
+            rows = np.arange(1, self.h + 1)[:, None] * (self.w + 2)
+            self._interior = (rows + np.arange(1, self.w + 1)[None, :]).ravel()
+        return self._interior
+
+    def neighbor_table(self, connectivity: int = 4) -> np.ndarray:
+        return neighbor_table(self.h, self.w, connectivity)
+
+    def shifted(self, dx: int, dy: int) -> np.ndarray:
+        """A view the size of the interior holding each cell's neighbor at (x + dx, y + dy)."""
+        return self.padded[1 + dy : self.h + 1 + dy, 1 + dx : self.w + 1 + dx]
+
+    def neighbors(self, connectivity: int = 4) -> Iterator[np.ndarray]:
+        return (self.shifted(dx, dy) for dx, dy in OFFSETS[connectivity])
+
+    def neighbor_min(self, connectivity: int = 4) -> np.ndarray:
+        return np.minimum.reduce(list(self.neighbors(connectivity)))
+
+    def neighbor_sum(self, connectivity: int = 8, dtype=np.int16) -> np.ndarray:
+        total = np.zeros((self.h, self.w), dtype=dtype)
+        for view in self.neighbors(connectivity):
+            total += view
+        return total
+
+    def render(self, chars: Optional[str] = None) -> str:
+        """The interior as text. chars maps each value to a character, otherwise values are printed as digits."""
+        if chars is None:
+            return "\n".join("".join(str(v) for v in row) for row in self.values)
+        return "\n".join("".join(chars[v] for v in row) for row in self.values)
@@ -0,0 +1,98 @@
+"""Line-at-a-time puzzle input for preprocess().
+
+    def preprocess():
+        return [int(line) for line in input_lines(day=aoc_day, year=aoc_year)]
+
+Unlike aocd.get_data().splitlines(), this never holds a list of every line. When the runner has the input as a
+file, set with input_file(), lines are read from it through a buffered reader, so a generated input of hundreds
+of megabytes parses in memory proportional to what preprocess() keeps. Otherwise the text comes from
+aocd.get_data(), which is still how the runner's overrides and each module's test() supply input, and is walked
+without splitting it up front. The file is only read while aocd.get_data() is still the override it came with, so
+a test() that feeds examples through aocd gets its examples, not the file.
+"""
+
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+CHUNK = 1 << 20
+
+# the file, and the aocd.get_data() replacement that serves the same text
+_file: Optional[Tuple[Path, Callable]] = None
+
+
+@contextmanager
+def input_file(path: Optional[Path], get_data: Callable):
+    """Make input_lines() read from path until the block exits, for as long as aocd.get_data is get_data.
+
+    None leaves the current source alone.
+    """
+    global _file
+    if path is None:
+        yield
+        return
+    previous, _file = _file, (Path(path), get_data)
+    try:
+        yield
+    finally:
+        _file = previous
+
+
+def _read(f: io.TextIOBase) -> Iterator[str]:
+    """CHUNK-sized pieces of f, each ending at a line boundary. Only the last can end partway through a line."""
+    carry = ""
+    while True:
+        chunk = f.read(CHUNK)
+        if not chunk:
+            break
+        cut = chunk.rfind("\n") + 1
+        if not cut:
+            carry += chunk
+            continue
+        yield carry + chunk[:cut]
+        carry = chunk[cut:]
+    if carry:
+        yield carry
+
+
+def _lines(f: io.TextIOBase) -> Iterator[str]:
+    # Like splitlines() on aocd's stripped text: no line endings, and no blank lines at the end. Splitting a chunk
+    # at a time is much faster than iterating over the file's lines.
+    blank = 0
+    for chunk in _read(f):
+        lines = chunk.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        end = len(lines)
+        while end and not lines[end - 1]:
+            end -= 1
+        if end:
+            if blank:
+                yield from [""] * blank
+            yield from lines[:end] if end < len(lines) else lines
+            blank = len(lines) - end
+        else:
+            blank += len(lines)
+
+
+def _open(day: int, year: int) -> io.TextIOBase:
+    import aocd
+
+    if _file is not None and aocd.get_data is _file[1]:
+        return _file[0].open()
+    return io.StringIO(aocd.get_data(day=day, year=year), newline=None)
+
+
+def input_lines(day: int, year: int) -> Iterator[str]:
+    with _open(day, year) as f:
+        yield from _lines(f)
+
+
+def input_chunks(day: int, year: int) -> Iterator[str]:
+    """The input as text in pieces of about CHUNK characters that each end at a line boundary.
+
+    For parsers that work in bulk, like aoc_common.parse.ints(), which would otherwise need the whole text at once.
+    """
+    with _open(day, year) as f:
+        yield from _read(f)
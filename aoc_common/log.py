@@ -0,0 +1,77 @@
+"""A thin logging facade over loguru for solver hot loops.
+
+Messages use loguru's brace formatting, so arguments are only formatted into the message when it is emitted:
+
+    log.debug("pc: {} - a={}, b={}", pc, a, b)
+
+Arguments wrapped in lazy() are called first, and only if the message is emitted, which keeps expensive
+renderings like a whole grid out of the hot path. Other arguments are passed as they are, callables included:
+
+    log.debug("grid:\\n{}", lazy(lambda: render(grid)))
+
+The runner calls set_level() with its own level, which swaps every method below it for a no-op. A disabled call
+then costs one call with already-evaluated arguments, with no level lookup in loguru at all. For blocks that do
+real work just to log, guard them with log.enabled("DEBUG").
+"""
+
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+LEVELS: Dict[str, int] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+# above every level, so set_level(OFF) silences everything that goes through the facade
+OFF = "OFF"
+
+
+class lazy:
+    """An argument that's only computed if its message is emitted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+
+def _noop(*_, **__):
+    pass
+
+
+def _emitter(level: str):
+    # depth=1 so records point at the solver that called the facade, not at emit()
+    method = getattr(logger.opt(depth=1), level.lower())
+
+    def emit(message: str, *args, **kwargs):
+        method(message, *(a.fn() if type(a) is lazy else a for a in args), **kwargs)
+
+    return emit
+
+
+class Log:
+    def __init__(self, level: str = "TRACE"):
+        self.level = level
+        self.set_level(level)
+
+    def set_level(self, level: str):
+        threshold = LEVELS.get(level.upper(), max(LEVELS.values()) + 1)
+        self.level = level
+        self._threshold = threshold
+        for name, no in LEVELS.items():
+            setattr(self, name.lower(), _emitter(name) if no >= threshold else _noop)
+
+    def enabled(self, level: str) -> bool:
+        return LEVELS[level.upper()] >= self._threshold
+
+
+log = Log()
+
+
+def set_level(level: str):
+    log.set_level(level)
@@ -0,0 +1,117 @@
+"""Nonces whose MD5 starts with a hex prefix, searched across a process pool.
+
+    for nonce, digest in prefix_hits("abc", "00000"):
+        ...
+
+Each worker hashes the secret once and copies that state per nonce, so only the nonce's digits are hashed each
+time. It compares raw digest bytes, never hex strings. The nonce range is cut into chunks that are handed out in
+order, a few per worker at a time, and results are taken back in chunk order. Hits therefore come out in nonce
+order, and a caller that stops iterating has wasted at most the chunks still in flight.
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    # the builtin MD5 copies faster than OpenSSL's for short messages like these
+    from _md5 import md5
+except ImportError:
+    from hashlib import md5
+
+CHUNK = 1 << 17
+# chunks queued per worker, so a worker never waits on the parent for its next one
+AHEAD = 2
+
+
+@dataclass
+class HashStats:
+    hashes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.hashes / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return f"hashed {self.hashes:,} nonces in {self.seconds:.2f}s, {self.rate / 1e6:.2f}M hashes/s"
+
+
+def _matcher(prefix: str) -> Tuple[bytes, Optional[int]]:
+    """The whole bytes the digest must start with, and the high nibble of the next byte for an odd-length prefix."""
+    whole = bytes.fromhex(prefix[: len(prefix) // 2 * 2])
+    return whole, int(prefix[-1], 16) if len(prefix) % 2 else None
+
+
+def _scan(secret: bytes, prefix: str, start: int, stop: int) -> List[Tuple[int, bytes]]:
+    whole, nibble = _matcher(prefix)
+    n = len(whole)
+    base = md5(secret)
+    hits = []
+    for i in range(start, stop):
+        h = base.copy()
+        h.update(b"%d" % i)
+        digest = h.digest()
+        if digest.startswith(whole) and (nibble is None or digest[n] >> 4 == nibble):
+            hits.append((i, digest))
+    return hits
+
+
+def prefix_hits(
+    secret: str,
+    prefix: str,
+    start: int = 0,
+    jobs: Optional[int] = None,
+    chunk: int = CHUNK,
+    stats: Optional[HashStats] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """Every (nonce, digest) from start upwards where md5(secret + nonce) starts with prefix, in nonce order.
+
+    The search never ends on its own, so take as many hits as needed and stop. jobs defaults to one worker per CPU.
+    With one job, or inside a daemonic process that can't start workers, chunks are hashed in this process. stats,
+    if given, is kept up to date with the nonces hashed in the chunks whose hits have been taken so far.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if stats is None:
+        stats = HashStats()
+    began = time.perf_counter()
+    key = secret.encode()
+    bounds = ((lo, lo + chunk) for lo in range(start, 1 << 63, chunk))
+    if jobs == 1 or multiprocessing.current_process().daemon:
+        for lo, hi in bounds:
+            hits = _scan(key, prefix, lo, hi)
+            stats.hashes += hi - lo
+            stats.seconds = time.perf_counter() - began
+            yield from hits
+        return
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending = deque(
+            (hi - lo, pool.submit(_scan, key, prefix, lo, hi))
+            for lo, hi in itertools.islice(bounds, jobs * AHEAD)
+        )
+        while True:
+            size, future = pending.popleft()
+            lo, hi = next(bounds)
+            pending.append((hi - lo, pool.submit(_scan, key, prefix, lo, hi)))
+            hits = future.result()
+            stats.hashes += size
+            stats.seconds = time.perf_counter() - began
+            yield from hits
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def first_hits(
+    secret: str, prefix: str, k: int = 1, start: int = 0, jobs: Optional[int] = None
+) -> Tuple[List[Tuple[int, bytes]], HashStats]:
+    """The first k hits of prefix_hits(), and how much hashing it took to find them."""
+    stats = HashStats()
+    with closing(prefix_hits(secret, prefix, start, jobs, stats=stats)) as hits:
+        return list(itertools.islice(hits, k)), stats
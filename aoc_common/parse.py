@@ -0,0 +1,69 @@
+"""Pull every integer out of puzzle input in one pass, instead of splitting lines and calling int() per token.
+
+    segments = ints(text, columns=4)  # "0,9 -> 5,9" lines become rows of [0, 9, 5, 9]
+
+Anything that isn't a digit separates numbers. A minus sign makes a number negative when it comes right before
+the digits and isn't itself right after a digit, so "x=-3" and "1,-2" have negatives, while ranges like "2-4" and
+arrows like "->" don't. Conversion happens in numpy, so a million-line input parses in a fraction of a second.
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# every byte but digits and "-" becomes a space
+_SEPARATE = bytes(c if chr(c) in "0123456789-" else 32 for c in range(256))
+_SPACE, _MINUS, _ZERO, _NINE = 32, ord("-"), ord("0"), ord("9")
+
+
+def _ints(text: str, dtype) -> "np.ndarray":
+    import numpy as np
+
+    data = bytearray(text.encode().translate(_SEPARATE))
+    cleaned = np.frombuffer(data, dtype=np.uint8)
+    minus = np.flatnonzero(cleaned == _MINUS)
+    if len(minus):
+        after = np.append(cleaned, _SPACE)[minus + 1]
+        before = cleaned[np.maximum(minus - 1, 0)]
+        sign = (_ZERO <= after) & (after <= _NINE) & ((minus == 0) | (before == _SPACE))
+        cleaned[minus[~sign]] = _SPACE
+    data = bytes(data).strip()
+    if not data:
+        # fromstring reads a lone 0 out of nothing but spaces
+        return np.empty(0, dtype=dtype)
+    return np.fromstring(data, dtype=dtype, sep=" ")
+
+
+def ints(
+    text: Union[str, Iterable[str]], columns: Optional[int] = None, dtype="int64"
+) -> "np.ndarray":
+    """Every integer in text, in order, reshaped to rows of columns if given.
+
+    text can also be an iterable of pieces that each end between numbers, like aoc_common.inputs.input_chunks().
+    """
+    # numpy is slow to import, so days that parse with this only pay for it once they parse
+    import numpy as np
+
+    if isinstance(text, str):
+        values = _ints(text, dtype)
+    else:
+        values = np.concatenate(
+            [np.empty(0, dtype=dtype)] + [_ints(t, dtype) for t in text]
+        )
+    if columns is None:
+        return values
+    if len(values) % columns:
+        raise ValueError(
+            f"Found {len(values)} integers, which don't divide into rows of {columns}"
+        )
+    return values.reshape(-1, columns)
+
+
+def int_array(text: Union[str, Iterable[str]], typecode: str = "q") -> array:
+    """Every integer in text as an array.array, for solvers that index element by element, where numpy scalars
+    are slow."""
+    values = array(typecode)
+    values.frombytes(ints(text, dtype=values.typecode).tobytes())
+    return values
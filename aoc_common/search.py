@@ -0,0 +1,127 @@
+"""Shortest paths over implicit graphs.
+
+The graph is a callback from a state to its (neighbor, edge cost) pairs, so nothing has to be built up front:
+
+    result = shortest_path(start, lambda i: ((n, risk[n]) for n in table[i]), lambda i: i == end)
+
+With a heuristic it's A*. The heuristic must be admissible and consistent, since a state is expanded at most
+once. key() maps states to what makes them the same, for states like dicts that aren't hashable or that carry
+bookkeeping that shouldn't distinguish them. Only the cheapest way found to each key stays on the frontier.
+
+When every edge raises the priority (cost plus any change in the heuristic) by at most max_step, a ring of
+max_step + 1 buckets (Dial's algorithm) replaces the heap, making pushes and pops O(1). That suits grids with
+small integer costs, like risk levels from 1 to 9.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+S = TypeVar("S")
+
+
+@dataclass
+class SearchStats:
+    expanded: int = 0
+    pushed: int = 0
+    peak_frontier: int = 0
+
+    def __str__(self):
+        return f"expanded {self.expanded} states, pushed {self.pushed}, peak frontier {self.peak_frontier}"
+
+
+@dataclass
+class SearchResult(Generic[S]):
+    cost: Optional[int]
+    state: Optional[S]
+    stats: SearchStats = field(default_factory=SearchStats)
+
+    @property
+    def found(self) -> bool:
+        return self.state is not None
+
+
+def shortest_path(
+    start: S,
+    neighbors: Callable[[S], Iterable[Tuple[S, int]]],
+    is_goal: Callable[[S], bool],
+    heuristic: Optional[Callable[[S], int]] = None,
+    key: Optional[Callable[[S], Hashable]] = None,
+    max_step: Optional[int] = None,
+) -> SearchResult[S]:
+    """The cheapest goal state reachable from start, and its cost. cost and state are None if there is none."""
+    if max_step is None:
+        return _heap_search(start, neighbors, is_goal, heuristic, key)
+    return _bucket_search(start, neighbors, is_goal, heuristic, key, max_step)
+
+
+def _heap_search(start, neighbors, is_goal, h, key) -> SearchResult:
+    stats = SearchStats()
+    best: Dict[Hashable, int] = {key(start) if key else start: 0}
+    # the counter breaks ties, so states themselves are never compared
+    order = itertools.count()
+    frontier = [(h(start) if h else 0, next(order), 0, start)]
+    while frontier:
+        stats.peak_frontier = max(stats.peak_frontier, len(frontier))
+        _, _, cost, state = heapq.heappop(frontier)
+        if cost > best[key(state) if key else state]:
+            continue
+        if is_goal(state):
+            return SearchResult(cost, state, stats)
+        stats.expanded += 1
+        for neighbor, step in neighbors(state):
+            new_cost = cost + step
+            k = key(neighbor) if key else neighbor
+            if new_cost >= best.get(k, new_cost + 1):
+                continue
+            best[k] = new_cost
+            heapq.heappush(
+                frontier,
+                (
+                    new_cost + h(neighbor) if h else new_cost,
+                    next(order),
+                    new_cost,
+                    neighbor,
+                ),
+            )
+            stats.pushed += 1
+    return SearchResult(None, None, stats)
+
+
+def _bucket_search(start, neighbors, is_goal, h, key, max_step) -> SearchResult:
+    stats = SearchStats()
+    best: Dict[Hashable, int] = {key(start) if key else start: 0}
+    ring = max_step + 1
+    buckets = [[] for _ in range(ring)]
+    priority = h(start) if h else 0
+    buckets[priority % ring].append((0, start))
+    size = 1
+    while size:
+        bucket = buckets[priority % ring]
+        while not bucket:
+            priority += 1
+            bucket = buckets[priority % ring]
+        stats.peak_frontier = max(stats.peak_frontier, size)
+        cost, state = bucket.pop()
+        size -= 1
+        if cost > best[key(state) if key else state]:
+            continue
+        if is_goal(state):
+            return SearchResult(cost, state, stats)
+        stats.expanded += 1
+        for neighbor, step in neighbors(state):
+            new_cost = cost + step
+            k = key(neighbor) if key else neighbor
+            if new_cost >= best.get(k, new_cost + 1):
+                continue
+            best[k] = new_cost
+            new_priority = new_cost + h(neighbor) if h else new_cost
+            if not priority <= new_priority <= priority + max_step:
+                raise ValueError(
+                    f"Priority went from {priority} to {new_priority}, outside the bucket queue's max_step of {max_step}"
+                )
+            buckets[new_priority % ring].append((new_cost, neighbor))
+            size += 1
+            stats.pushed += 1
+    return SearchResult(None, None, stats)
@@ -0,0 +1,96 @@
+"""Spans for a timeline of where a run spends its time, exported as Chrome trace-event JSON.
+
+A span times a block or every call to a function:
+
+    with span("build graph", nodes=len(graph)):
+        ...
+
+    @span("search")
+    def min_risk_path(graph, start, end):
+        ...
+
+Nothing is recorded unless start_tracing() has been called, and while tracing is off a span costs one global
+lookup on entry and exit. Load the file written by write_trace() in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+_events: Optional[List[Dict[str, Any]]] = None
+
+
+class span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str = "solver", **args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        if _events is not None:
+            self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        if _events is not None and self.start is not None:
+            _record(self.name, self.category, self.start, self.args)
+        self.start = None
+
+    def __call__(self, fn: Callable) -> Callable:
+        name, category, args = self.name, self.category, self.args
+
+        @functools.wraps(fn)
+        def spanned(*a, **kw):
+            if _events is None:
+                return fn(*a, **kw)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*a, **kw)
+            finally:
+                _record(name, category, start, args)
+
+        return spanned
+
+
+def _record(name: str, category: str, start: int, args: Dict[str, Any]):
+    end = time.perf_counter_ns()
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start / 1000,
+        "dur": (end - start) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = {k: str(v) for k, v in args.items()}
+    _events.append(event)
+
+
+def start_tracing():
+    global _events
+    _events = []
+
+
+def stop_tracing() -> List[Dict[str, Any]]:
+    global _events
+    events, _events = _events or [], None
+    return events
+
+
+def tracing() -> bool:
+    return _events is not None
+
+
+def write_trace(events: List[Dict[str, Any]], path: Path):
+    with path.open("w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        f.write("\n")
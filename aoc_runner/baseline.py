@@ -0,0 +1,153 @@
+import json
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .bench import DayBench
+from .days import PHASES
+from .phases import format_bytes
+
+BASELINE_VERSION = 1
+
+
+def phase_key(year: int, day: int, phase: str) -> str:
+    return f"{year}/{day:02}/{phase}"
+
+
+def make_baseline(results: List[DayBench], repeat: int, warmup: int) -> Dict:
+    entries = {}
+    for r in results:
+        for phase, stats in r.phases.items():
+            entries[phase_key(r.year, r.day, phase)] = {
+                "median": stats.median,
+                "min": stats.min,
+                "p95": stats.p95,
+                "peak_memory": stats.peak_memory,
+            }
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "entries": entries,
+    }
+
+
+def save_baseline(baseline: Dict, path: Path):
+    with path.open("w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path: Path) -> Dict:
+    with path.open() as f:
+        try:
+            baseline = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} isn't valid JSON: {e}") from e
+    if not isinstance(baseline, dict) or "entries" not in baseline:
+        raise ValueError(f"{path} isn't a baseline file")
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(
+            f"{path} is baseline version {baseline.get('version')}, expected {BASELINE_VERSION}"
+        )
+    return baseline
+
+
+def has_entries(baseline: Dict, year: int, day: int) -> bool:
+    prefix = phase_key(year, day, "")
+    return any(key.startswith(prefix) for key in baseline["entries"])
+
+
+# statuses that fail the regression gate
+FAILING = ("slower", "error", "missing")
+
+
+@dataclass
+class Comparison:
+    key: str
+    old: float
+    new: Optional[float]
+    old_memory: Optional[int]
+    new_memory: Optional[int]
+    status: str
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.new is None:
+            return None
+        return self.new / self.old if self.old else float("inf")
+
+
+def compare(
+    baseline: Dict,
+    results: List[DayBench],
+    threshold: float = 0.1,
+    min_time: float = 0.001,
+    phases: Iterable[str] = PHASES,
+) -> List[Comparison]:
+    """Compare medians against the baseline, for the given phases of the days in results.
+
+    A phase regresses when its median grows by more than threshold (as a fraction), and speeds up when it shrinks
+    by the same factor. Phases where both medians are under min_time are too noisy to call either way. Every
+    baseline phase of a day that errored is an "error", and one that a day no longer reports is "missing", since
+    either would otherwise slip past a check that only looks for slowdowns.
+    """
+    comparisons = []
+    entries = baseline["entries"]
+    for r in results:
+        for phase in phases:
+            key = phase_key(r.year, r.day, phase)
+            if key not in entries:
+                continue
+            old = entries[key]
+            stats = r.phases.get(phase)
+            if stats is None:
+                comparisons.append(
+                    Comparison(
+                        key,
+                        old["median"],
+                        None,
+                        old.get("peak_memory"),
+                        None,
+                        "error" if r.error else "missing",
+                    )
+                )
+                continue
+            status = "same"
+            if r.error:
+                status = "error"
+            elif max(old["median"], stats.median) < min_time:
+                status = "noise"
+            elif stats.median > old["median"] * (1 + threshold):
+                status = "slower"
+            elif stats.median * (1 + threshold) < old["median"]:
+                status = "faster"
+            comparisons.append(
+                Comparison(
+                    key,
+                    old["median"],
+                    stats.median,
+                    old.get("peak_memory"),
+                    stats.peak_memory,
+                    status,
+                )
+            )
+    return comparisons
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    header = f"{'phase':<18} {'baseline':>10} {'now':>10} {'ratio':>7} {'baseline mem':>12} {'now mem':>12}  status"
+    lines = [header, "-" * len(header)]
+    for c in comparisons:
+        new = "-" if c.new is None else f"{c.new:.6f}"
+        ratio = "-" if c.ratio is None else f"{c.ratio:.2f}x"
+        lines.append(
+            f"{c.key:<18} {c.old:>10.6f} {new:>10} {ratio:>7} "
+            f"{format_bytes(c.old_memory):>12} {format_bytes(c.new_memory):>12}  {c.status}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,262 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from aoc_common.log import set_level
+
+from .cache import (
+    AnswerCache,
+    ContextCache,
+    module_hash,
+    preprocess_with_cache,
+    text_hash,
+)
+from .days import input_override, load_day, load_input, phase_function
+from .limits import Limits, solve_part_limited
+from .phases import PhaseResult, measure
+
+
+@dataclass
+class DayResult:
+    year: int
+    day: int
+    answers: Dict[int, str] = field(default_factory=dict)
+    phases: List[PhaseResult] = field(default_factory=list)
+    cached: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+    source: Optional[str] = None
+
+    @property
+    def solve_time(self):
+        return sum(p.elapsed for p in self.phases)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def init_worker(log_level: str):
+    """Worker processes start with loguru's default handler, so give them the same one the CLI configured."""
+    logger.remove()
+    logger.add(sys.stderr, level=log_level)
+    set_level(log_level)
+
+
+def solve_day(
+    year: int,
+    day: int,
+    text: Optional[str] = None,
+    parts: Tuple[int, ...] = (1, 2),
+    memory: Optional[str] = None,
+    cache: Optional[AnswerCache] = None,
+    context_cache: Optional[ContextCache] = None,
+    limits: Optional[Limits] = None,
+    path: Optional[Path] = None,
+) -> DayResult:
+    """Preprocess and solve one day, reading its input from aocd unless text is supplied.
+
+    This is meant to run in a pool worker. The module import and the aocd.get_data override both happen in the
+    calling process, so concurrent days never see each other's input. If text was read from path, modules that
+    stream their input read the file instead. With limits, each part runs in its own
+    child process instead, and a part that is cut off is reported in error.
+    """
+    result = DayResult(year, day)
+    if text is None:
+        text = load_input(year, day)
+        if text is None:
+            result.error = "no input available"
+            return result
+    day_module = load_day(year, day)
+    if day_module is None:
+        result.error = "module could not be loaded"
+        return result
+    input_hash = text_hash(text)
+    source_hash = module_hash(day_module)
+    if cache:
+        for n in parts:
+            answer = cache.get(year, day, n, input_hash, source_hash)
+            if answer is not None:
+                result.answers[n] = answer
+                result.cached.append(n)
+    if limits:
+        return _solve_day_limited(
+            result, day_module, text, parts, memory, cache, context_cache, limits
+        )
+    with input_override(text, path):
+        try:
+            data = []
+            preprocess = phase_function(day_module, "preprocess")
+            if preprocess and len(result.cached) < len(parts):
+                data, phase = preprocess_with_cache(
+                    preprocess,
+                    year,
+                    day,
+                    context_cache,
+                    input_hash,
+                    source_hash,
+                    memory=memory,
+                )
+                result.phases.append(phase)
+            for n in parts:
+                solver = phase_function(day_module, f"part{n}")
+                if solver is None or n in result.cached:
+                    continue
+                answer, phase = measure(f"part{n}", solver, data, memory=memory)
+                result.phases.append(phase)
+                result.answers[n] = str(answer)
+                if cache:
+                    cache.put(
+                        year, day, n, input_hash, source_hash, answer, phase.elapsed
+                    )
+        except Exception as e:
+            logger.error(f"year={year} day={day} failed: {e!r}")
+            result.error = repr(e)
+    return result
+
+
+def _solve_day_limited(
+    result: DayResult,
+    day_module: ModuleType,
+    text: str,
+    parts: Tuple[int, ...],
+    memory: Optional[str],
+    cache: Optional[AnswerCache],
+    context_cache: Optional[ContextCache],
+    limits: Limits,
+) -> DayResult:
+    year, day = result.year, result.day
+    errors = []
+    for n in parts:
+        if phase_function(day_module, f"part{n}") is None or n in result.cached:
+            continue
+        outcome = solve_part_limited(year, day, n, text, limits, memory, context_cache)
+        result.phases.extend(outcome.phases)
+        if not outcome.ok:
+            logger.error(f"year={year} day={day} {outcome.describe(limits)}")
+            errors.append(outcome.describe(limits))
+            continue
+        result.answers[n] = outcome.answer
+        if cache:
+            cache.put(
+                year,
+                day,
+                n,
+                text_hash(text),
+                module_hash(day_module),
+                outcome.answer,
+                outcome.phases[-1].elapsed,
+            )
+    if errors:
+        result.error = "; ".join(errors)
+    return result
+
+
+def solve_all(
+    days: Iterable[Tuple[int, int]],
+    jobs: Optional[int] = None,
+    memory: Optional[str] = None,
+    log_level: str = "SUCCESS",
+    cache: Optional[AnswerCache] = None,
+    context_cache: Optional[ContextCache] = None,
+    limits: Optional[Limits] = None,
+) -> List[DayResult]:
+    """Solve every (year, day) in a process pool, returning results in the order they were given."""
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=(log_level,)
+    ) as pool:
+        futures = [
+            pool.submit(
+                solve_day,
+                year,
+                day,
+                memory=memory,
+                cache=cache,
+                context_cache=context_cache,
+                limits=limits,
+            )
+            for year, day in days
+        ]
+        return [f.result() for f in futures]
+
+
+def solve_inputs(
+    year: int,
+    day: int,
+    paths: List[Path],
+    parts: Tuple[int, ...] = (1, 2),
+    jobs: Optional[int] = None,
+    memory: Optional[str] = None,
+    log_level: str = "SUCCESS",
+    cache: Optional[AnswerCache] = None,
+    limits: Optional[Limits] = None,
+) -> Tuple[List[DayResult], float]:
+    """Solve one day for every input file in a process pool. Returns results in path order and the wall time."""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=(log_level,)
+    ) as pool:
+        futures = [
+            pool.submit(
+                solve_day,
+                year,
+                day,
+                path.read_text(),
+                parts,
+                memory=memory,
+                cache=cache,
+                limits=limits,
+                path=path,
+            )
+            for path in paths
+        ]
+        results = []
+        for path, f in zip(paths, futures):
+            result = f.result()
+            result.source = path.name
+            results.append(result)
+    return results, time.perf_counter() - start
+
+
+def format_input_results(results: List[DayResult], wall_time: float) -> str:
+    width = max([len("input")] + [len(r.source) for r in results])
+    header = f"{'input':<{width}} {'part1':>20} {'part2':>20} {'time':>12}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error and not r.answers:
+            lines.append(f"{r.source:<{width}} error: {r.error}")
+            continue
+        lines.append(
+            f"{r.source:<{width}} {r.answers.get(1, '-'):>20} {r.answers.get(2, '-'):>20} {r.solve_time:>11.6f}s"
+        )
+        if r.error:
+            lines.append(f"{'':<{width}} error: {r.error}")
+    solved = sum(r.error is None for r in results)
+    busy = sum(r.solve_time for r in results)
+    lines.append(
+        f"{solved} of {len(results)} inputs solved in {wall_time:.3f}s wall time, "
+        f"{len(results) / wall_time if wall_time else 0:.2f} inputs/s"
+    )
+    lines.append(
+        f"{busy:.3f}s of solve time, {busy / wall_time if wall_time else 0:.2f}x parallelism"
+    )
+    return "\n".join(lines)
+
+
+def format_results(results: List[DayResult]) -> str:
+    header = f"{'year':>4} {'day':>3} {'part1':>20} {'part2':>20} {'time':>12}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error and not r.answers:
+            lines.append(f"{r.year:>4} {r.day:>3} error: {r.error}")
+            continue
+        lines.append(
+            f"{r.year:>4} {r.day:>3} {r.answers.get(1, '-'):>20} {r.answers.get(2, '-'):>20} {r.solve_time:>11.6f}s"
+        )
+        if r.error:
+            lines.append(f"{'':>8} error: {r.error}")
+    return "\n".join(lines)
@@ -0,0 +1,130 @@
+import statistics
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from .days import PHASES, input_override, load_day, phase_function
+from .phases import format_bytes, measure
+
+
+@dataclass
+class PhaseStats:
+    samples: List[float] = field(default_factory=list)
+    peak_memory: Optional[int] = None
+
+    @property
+    def min(self):
+        return min(self.samples)
+
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self):
+        ordered = sorted(self.samples)
+        # nearest-rank percentile, so small sample counts still report an observed time
+        rank = max(0, -(-95 * len(ordered) // 100) - 1)
+        return ordered[rank]
+
+    def as_dict(self):
+        return {
+            "min": self.min,
+            "median": self.median,
+            "p95": self.p95,
+            "samples": self.samples,
+            "peak_memory": self.peak_memory,
+        }
+
+
+@dataclass
+class DayBench:
+    year: int
+    day: int
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def as_dict(self):
+        return {
+            "year": self.year,
+            "day": self.day,
+            "phases": {k: v.as_dict() for k, v in self.phases.items()},
+            "error": self.error,
+        }
+
+
+def bench_day(
+    year: int,
+    day: int,
+    text: str,
+    repeat: int = 5,
+    warmup: int = 1,
+    parts=(1, 2),
+    memory: Optional[str] = None,
+) -> DayBench:
+    """Time each phase repeat times after warmup untimed runs.
+
+    If memory is set, peak memory comes from one extra run per phase afterwards, so tracing never skews the
+    timings.
+    """
+    result = DayBench(year, day)
+    day_module = load_day(year, day)
+    if day_module is None:
+        result.error = "module could not be loaded"
+        return result
+    preprocess = phase_function(day_module, "preprocess") or (lambda: [])
+    phases = ["preprocess"] + [f"part{p}" for p in parts]
+    solvers = {p: phase_function(day_module, p) for p in phases[1:]}
+
+    def run_phase(phase, memory_mode=None):
+        if phase == "preprocess":
+            return measure(phase, preprocess, memory=memory_mode)[1]
+        # every part gets a fresh context, since some parts stash results in it
+        context = preprocess()
+        return measure(phase, solvers[phase], context, memory=memory_mode)[1]
+
+    phases = [p for p in phases if p == "preprocess" or solvers[p] is not None]
+    with input_override(text):
+        try:
+            for i in range(warmup + repeat):
+                for phase in phases:
+                    elapsed = run_phase(phase).elapsed
+                    if i >= warmup:
+                        result.phases.setdefault(phase, PhaseStats()).samples.append(
+                            elapsed
+                        )
+            if memory:
+                for phase in phases:
+                    result.phases[phase].peak_memory = run_phase(
+                        phase, memory
+                    ).peak_memory
+        except Exception as e:
+            logger.error(f"year={year} day={day} failed during benchmark: {e!r}")
+            result.error = repr(e)
+    return result
+
+
+def format_table(results: List[DayBench]) -> str:
+    show_memory = any(
+        s.peak_memory is not None for r in results for s in r.phases.values()
+    )
+    header = (
+        f"{'year':>4} {'day':>3} {'phase':<10} {'min':>10} {'median':>10} {'p95':>10}"
+    )
+    if show_memory:
+        header += f" {'peak memory':>12}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error and not r.phases:
+            lines.append(f"{r.year:>4} {r.day:>3} error: {r.error}")
+            continue
+        for phase in PHASES:
+            if phase not in r.phases:
+                continue
+            s = r.phases[phase]
+            line = f"{r.year:>4} {r.day:>3} {phase:<10} {s.min:>10.6f} {s.median:>10.6f} {s.p95:>10.6f}"
+            if show_memory:
+                line += f" {format_bytes(s.peak_memory):>12}"
+            lines.append(line)
+    return "\n".join(lines)
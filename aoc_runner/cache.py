@@ -0,0 +1,220 @@
+import ast
+import hashlib
+import json
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .phases import PhaseResult, measure
+
+
+def default_cache_root() -> Path:
+    """AOC_CACHE_DIR if it's set, otherwise a cache directory next to aocd's data under AOCD_DIR."""
+    if os.getenv("AOC_CACHE_DIR"):
+        return Path(os.getenv("AOC_CACHE_DIR")).expanduser()
+    return Path(os.getenv("AOCD_DIR", "~/.config/aocd")).expanduser() / "aoc_cache"
+
+
+def text_hash(text: Union[str, bytes]) -> str:
+    if isinstance(text, str):
+        text = text.encode()
+    return hashlib.sha256(text).hexdigest()
+
+
+def _resolve(root: Path, parts: List[str]) -> Iterator[Path]:
+    """The source files under root that importing the dotted name parts would run: each package's __init__.py on the
+    way, then the module itself. Names that aren't files under root, like third-party packages, yield nothing.
+    """
+    path = root
+    for part in parts:
+        path = path / part
+        if (path / "__init__.py").is_file():
+            yield path / "__init__.py"
+        elif path.with_suffix(".py").is_file():
+            yield path.with_suffix(".py")
+            return
+        else:
+            return
+
+
+def _local_imports(path: Path, root: Path) -> Iterator[Path]:
+    # every import statement, including the deferred ones inside functions
+    for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield from _resolve(root, alias.name.split("."))
+        elif isinstance(node, ast.ImportFrom):
+            base = []
+            if node.level:
+                package = path.parents[node.level - 1]
+                if package != root and root not in package.parents:
+                    continue
+                base = list(package.relative_to(root).parts)
+            parts = base + (node.module.split(".") if node.module else [])
+            yield from _resolve(root, parts)
+            # from package import submodule
+            for alias in node.names:
+                yield from _resolve(root, parts + [alias.name])
+
+
+def local_sources(module: ModuleType) -> Tuple[Path, List[Path]]:
+    """The repo root, and the module's source file plus every repo-local one it imports, directly or through
+    others, in sorted order. Imports are found by reading the source, not by importing it.
+    """
+    start = Path(module.__file__).resolve()
+    root = start.parents[module.__name__.count(".")]
+    seen = {start}
+    pending = [start]
+    while pending:
+        for imported in _local_imports(pending.pop(), root):
+            if imported not in seen:
+                seen.add(imported)
+                pending.append(imported)
+    return root, sorted(seen)
+
+
+def module_hash(module: ModuleType) -> str:
+    """Hash of the module's source and of every repo-local module it imports, directly or through others.
+
+    Solvers lean on shared helpers like aoc_common's grid and parser, so a change to one of those has to miss the
+    cache just like a change to the day itself.
+    """
+    root, paths = local_sources(module)
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path.relative_to(root).as_posix()}\0".encode())
+        digest.update(text_hash(path.read_bytes()).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class AnswerCache:
+    """Answers on disk, content-addressed by input text and solution source so stale entries are never hit."""
+
+    root: Path
+
+    def path(
+        self, year: int, day: int, part: int, input_hash: str, source_hash: str
+    ) -> Path:
+        key = text_hash(f"{input_hash}:{source_hash}")
+        return (
+            self.root / "answers" / str(year) / f"{day:02}" / f"part{part}-{key}.json"
+        )
+
+    def get(
+        self, year: int, day: int, part: int, input_hash: str, source_hash: str
+    ) -> Optional[str]:
+        p = self.path(year, day, part, input_hash, source_hash)
+        try:
+            with p.open() as f:
+                return json.load(f)["answer"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {p}: {e}")
+            return None
+
+    def put(
+        self,
+        year: int,
+        day: int,
+        part: int,
+        input_hash: str,
+        source_hash: str,
+        answer: str,
+        elapsed: float = None,
+    ):
+        p = self.path(year, day, part, input_hash, source_hash)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "year": year,
+            "day": day,
+            "part": part,
+            "input_hash": input_hash,
+            "source_hash": source_hash,
+            "answer": str(answer),
+            "elapsed": elapsed,
+            "created": time.time(),
+        }
+        # write-then-rename so a concurrent reader never sees a half-written entry
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w") as f:
+            json.dump(entry, f)
+        tmp.replace(p)
+
+
+@dataclass
+class ContextCache:
+    """Pickled preprocess() results, keyed the same way as AnswerCache so a parser change invalidates them.
+
+    Only ever point this at a directory you own: loading a context unpickles it.
+    """
+
+    root: Path
+
+    def path(self, year: int, day: int, input_hash: str, source_hash: str) -> Path:
+        key = text_hash(f"{input_hash}:{source_hash}")
+        return self.root / "contexts" / str(year) / f"{day:02}" / f"{key}.pickle"
+
+    def load(
+        self, year: int, day: int, input_hash: str, source_hash: str
+    ) -> Tuple[bool, Any]:
+        p = self.path(year, day, input_hash, source_hash)
+        try:
+            with p.open("rb") as f:
+                return True, pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable context cache entry {p}: {e!r}")
+            return False, None
+
+    def save(self, year: int, day: int, input_hash: str, source_hash: str, context):
+        p = self.path(year, day, input_hash, source_hash)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as f:
+                pickle.dump(context, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Context for year={year} day={day} can't be cached: {e!r}")
+            tmp.unlink(missing_ok=True)
+            return
+        tmp.replace(p)
+
+
+def preprocess_with_cache(
+    preprocess: Callable,
+    year: int,
+    day: int,
+    context_cache: Optional[ContextCache],
+    input_hash: str,
+    source_hash: str,
+    memory: Optional[str] = None,
+) -> Tuple[Any, PhaseResult]:
+    """Run preprocess(), or load its result from context_cache when there is one and it has a hit.
+
+    A hit is reported as a "load" phase so the time spent unpickling stays visible next to the parts.
+    """
+    if context_cache is not None:
+        (hit, context), phase = measure(
+            "load",
+            context_cache.load,
+            year,
+            day,
+            input_hash,
+            source_hash,
+            memory=memory,
+        )
+        if hit:
+            return context, phase
+    context, phase = measure("preprocess", preprocess, memory=memory)
+    if context_cache is not None:
+        context_cache.save(year, day, input_hash, source_hash, context)
+    return context, phase
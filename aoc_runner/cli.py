@@ -1,31 +1,51 @@
 import importlib
 import os
 import sys
-import time
 from inspect import isfunction
-from typing import IO
+from pathlib import Path
+from typing import IO, Tuple
 
 import click
-import dotenv
-from click_option_group import MutuallyExclusiveOptionGroup, optgroup
 from loguru import logger
 
+from .phases import MEMORY_MODES, format_phases, measure
+
+PROFILE_MODES = ("cprofile", "sampling")
+
 # My template isn't updated with a good versioneer replacement for poetry yet. Maybe AOC2022 will be the thing
 # that makes me find one.
 __version__ = "0.1.0"
 
 
+# Commands that don't touch puzzle data, so startup can skip loading .env and the session check.
+OFFLINE_COMMANDS = ("version", "startup-profile", "gen")
+
+
+def parse_size_option(ctx: click.Context, param: click.Parameter, value: str):
+    if value is None:
+        return None
+    from .limits import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @click.group()
-@optgroup.group(
-    "Output Verbosity", cls=MutuallyExclusiveOptionGroup, help="(mutually exclusive)"
-)
-@optgroup.option(
+@click.option(
     "--verbose",
     "-v",
     count=True,
-    help="Enable verbose output. (Repeat multiple times to increase " "verbosity.)",
+    help="Enable verbose output. (Repeat multiple times to increase "
+    "verbosity.) Mutually exclusive with --quiet.",
+)
+@click.option(
+    "--quiet",
+    "-q",
+    count=True,
+    help="Only print error output. Mutually exclusive with --verbose.",
 )
-@optgroup.option("--quiet", "-q", count=True, help="Only print error output.")
 @click.option(
     "--errorfile",
     "error_file",
@@ -38,8 +58,16 @@ __version__ = "0.1.0"
     help="Additionally log all messages to specified file",
     type=click.Path(dir_okay=False, writable=True),
 )
-def aoc(quiet: int, verbose: int, error_file: str = None, trace_file: str = None):
-    dotenv.load_dotenv()
+@click.pass_context
+def aoc(
+    ctx: click.Context,
+    quiet: int,
+    verbose: int,
+    error_file: str = None,
+    trace_file: str = None,
+):
+    if quiet and verbose:
+        raise click.UsageError("--verbose and --quiet are mutually exclusive")
     level = "SUCCESS"
     if quiet > 0:
         level = "ERROR"
@@ -49,12 +77,21 @@ def aoc(quiet: int, verbose: int, error_file: str = None, trace_file: str = None
         level = "DEBUG"
     elif verbose >= 3:
         level = "TRACE"
+    ctx.ensure_object(dict)["log_level"] = level
     logger.remove()
     logger.add(sys.stderr, level=level)
+    from aoc_common.log import set_level
+
+    set_level(level)
     if error_file:
         logger.add(error_file, level="ERROR")
     if trace_file:
         logger.add(trace_file, level="TRACE")
+    if ctx.invoked_subcommand in OFFLINE_COMMANDS:
+        return
+    import dotenv
+
+    dotenv.load_dotenv()
     session_id = os.getenv("AOC_SESSION")
     if session_id is None:
         logger.warning(
@@ -88,19 +125,192 @@ def version():
     default=False,
     help="Force submit even if nondefault input is used",
 )
+@click.option(
+    "-m",
+    "--memory",
+    default=None,
+    type=click.Choice(MEMORY_MODES),
+    help="Also report peak memory per phase, traced by tracemalloc or as the rise in the RSS high-water mark",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Reuse answers computed earlier for the same input and module source",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Where cached results live (default $AOC_CACHE_DIR, or aoc_cache under $AOCD_DIR)",
+)
+@click.option(
+    "--context-cache",
+    "use_context_cache",
+    is_flag=True,
+    default=False,
+    help="Pickle preprocess() results and reuse them for the same input and module source",
+)
+@click.option(
+    "--profile",
+    default=None,
+    type=click.Choice(PROFILE_MODES),
+    help="Profile preprocess and each part separately, writing pstats and/or collapsed stacks",
+)
+@click.option(
+    "--profile-dir",
+    default=".",
+    type=click.Path(file_okay=False),
+    help="Where --profile writes its output files",
+)
+@click.option(
+    "--profile-top",
+    default=15,
+    type=int,
+    help="How many of the hottest functions --profile logs per phase",
+)
+@click.option(
+    "--via-daemon",
+    is_flag=True,
+    default=False,
+    help="Have a running `aoc serve` daemon solve the puzzle instead of solving it in this process",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="The daemon's socket (default $AOC_SOCKET, or aoc-UID.sock in the temp directory)",
+)
+@click.option(
+    "--timeout",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Kill a part that runs longer than this many seconds. Each part then runs in its own child process",
+)
+@click.option(
+    "--max-memory",
+    default=None,
+    callback=parse_size_option,
+    help="Limit each part's child process to this much address space, e.g. 512M or 2G",
+)
+@click.option(
+    "--trace-out",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the runner's and solvers' spans to this file as Chrome trace-event JSON",
+)
+@click.option(
+    "--tuned/--no-tuned",
+    default=False,
+    help="Use the variant `aoc tune` found fastest for inputs of this size, where there is one and its code is "
+    "unchanged since",
+)
+@click.option(
+    "--inputs",
+    "inputs_dir",
+    default=None,
+    type=click.Path(exists=True, file_okay=False),
+    help="Solve every input file in this directory in a process pool instead of a single input",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Worker processes to use with --inputs (default: one per CPU)",
+)
 @click.argument(
     "_input", metavar="INPUT", default=None, required=False, type=click.File(), nargs=1
 )
-def run(year: int, day: int, part: int, submit: bool, force: bool, _input: IO):
+@click.pass_context
+def run(
+    ctx: click.Context,
+    year: int,
+    day: int,
+    part: int,
+    submit: bool,
+    force: bool,
+    memory: str,
+    use_cache: bool,
+    cache_dir: str,
+    use_context_cache: bool,
+    profile: str,
+    profile_dir: str,
+    profile_top: int,
+    via_daemon: bool,
+    socket_path: str,
+    timeout: float,
+    max_memory: int,
+    trace_out: str,
+    tuned: bool,
+    inputs_dir: str,
+    jobs: int,
+    _input: IO,
+):
+    from .cache import (
+        AnswerCache,
+        ContextCache,
+        default_cache_root,
+        module_hash,
+        text_hash,
+        preprocess_with_cache,
+    )
+    from .days import input_override, load_input
+    from .limits import Limits
+
+    limits = Limits(timeout, max_memory)
+    if limits and (via_daemon or profile):
+        raise click.UsageError(
+            "--timeout and --max-memory can't be combined with --via-daemon or --profile"
+        )
+    if tuned and (via_daemon or limits or inputs_dir):
+        raise click.UsageError(
+            "--tuned only picks the solver in this process, so it can't be combined with --via-daemon, --inputs, "
+            "--timeout or --max-memory"
+        )
+    if trace_out and (via_daemon or limits):
+        raise click.UsageError(
+            "--trace-out only sees spans from this process, so it can't be combined with --via-daemon, "
+            "--timeout or --max-memory"
+        )
+    if inputs_dir:
+        if _input is not None or via_daemon or profile or trace_out:
+            raise click.UsageError(
+                "--inputs can't be combined with INPUT, --via-daemon, --profile or --trace-out"
+            )
+        if part == 0:
+            raise click.UsageError("--inputs can't run the tests")
+        from .batch import format_input_results, solve_inputs
+
+        paths = sorted(p for p in Path(inputs_dir).iterdir() if p.is_file())
+        if not paths:
+            logger.error(f"No input files in {inputs_dir}")
+            sys.exit(1)
+        logger.info(f"Solving year={year} day={day} for {len(paths)} inputs")
+        cache_root = Path(cache_dir) if cache_dir else default_cache_root()
+        results, wall_time = solve_inputs(
+            year,
+            day,
+            paths,
+            (part,) if part else (1, 2),
+            jobs,
+            memory,
+            ctx.obj["log_level"],
+            AnswerCache(cache_root) if use_cache else None,
+            limits,
+        )
+        click.echo(format_input_results(results, wall_time))
+        if any(r.error for r in results):
+            sys.exit(1)
+        return
     data = []
     do_submit = submit
+    input_path = None
     if _input is not None:
-        import aocd
-
-        def gd(*_, **__):
-            return _input.read()
-
-        aocd.get_data = gd
+        if _input.name != "-":
+            input_path = Path(_input.name)
+        text = _input.read()
         logger.debug(f"Processing input from {_input.name}")
         if submit and not force:
             logger.error(
@@ -108,6 +318,46 @@ def run(year: int, day: int, part: int, submit: bool, force: bool, _input: IO):
                 f"correct. Specify --force to submit anyway."
             )
             do_submit = False
+    else:
+        text = load_input(year, day)
+        if text is None:
+            sys.exit(1)
+
+    if via_daemon:
+        from .daemon import default_socket_path, request
+
+        if part == 0:
+            logger.error("Tests can't be run through the daemon")
+            sys.exit(1)
+        path = Path(socket_path) if socket_path else default_socket_path()
+        for n, subpart in ((1, "a"), (2, "b")):
+            if part is not None and part != n:
+                continue
+            try:
+                response = request(path, year, day, n, text)
+            except OSError as e:
+                logger.error(f"Unable to reach the daemon at {path}: {e}")
+                sys.exit(1)
+            if "error" in response:
+                logger.error(f"Part {n} failed in the daemon: {response['error']}")
+                sys.exit(1)
+            answer = response["answer"]
+            logger.success(f"Part {n}: {answer}")
+            logger.success(
+                f"Time elapsed in daemon: {response['elapsed']}s"
+                + (" (context was resident)" if response["context_cached"] else "")
+            )
+            if do_submit and part == n:
+                logger.debug(
+                    f"submitting answer={answer}, day={day}, year={year}, part={subpart}"
+                )
+                import aocd
+
+                aocd.submit(answer=answer, day=day, year=year, part=subpart)
+                logger.success(f"done")
+        return
+
+    ctx.with_resource(input_override(text, input_path))
 
     package = f"aoc_{year}"
 
@@ -116,60 +366,945 @@ def run(year: int, day: int, part: int, submit: bool, force: bool, _input: IO):
         logger.error(f"No module could be loaded for year={year} day={day}")
         sys.exit(1)
 
-    if isfunction(getattr(day_module, "preprocess", None)):
+    wanted = [n for n in (1, 2) if part is None or part == n]
+    cache_root = Path(cache_dir) if cache_dir else default_cache_root()
+    input_hash = text_hash(text)
+    source_hash = module_hash(day_module)
+    # answers are cached against the code that computed them, which a tuned variant can change per part
+    answer_hashes = {n: source_hash for n in wanted}
+    solvers = {n: getattr(day_module, f"part{n}", None) for n in wanted}
+    if tuned and getattr(day_module, "variants", None):
+        from .tuning import (
+            TuningStore,
+            tuned_solver,
+            tuned_variant,
+            tuning_path,
+            variant_hash,
+        )
+
+        if tuning_path(cache_root).exists():
+            store = TuningStore(tuning_path(cache_root))
+            for n in wanted:
+                variant = tuned_variant(store, year, day, n, text)
+                if variant is not None and not variant.default:
+                    logger.info(f"Part {n} uses tuned variant {variant.name}")
+                    solvers[n] = tuned_solver(variant, day_module)
+                    answer_hashes[n] = variant_hash(day_module, variant)
+            store.close()
+
+    cache = None
+    cached = {}
+    context_cache = ContextCache(cache_root) if use_context_cache else None
+    if use_cache and wanted:
+        cache = AnswerCache(cache_root)
+        cached = {
+            n: cache.get(year, day, n, input_hash, answer_hashes[n]) for n in wanted
+        }
+
+    profiler = None
+    if profile:
+        from .profiling import Profiler
+
+        profiler = Profiler(profile, Path(profile_dir), f"{year}-{day:02}", profile_top)
+
+    if trace_out:
+        from aoc_common.trace import span, start_tracing
+
+        start_tracing()
+
+    def instrumented(phase, fn):
+        if profiler and phase != "submit":
+            fn = profiler.wrap(phase, fn)
+        return span(phase, category="runner")(fn) if trace_out else fn
+
+    phases = []
+    # under limits, each part's child process preprocesses for itself
+    needs_data = not limits and any(cached.get(n) is None for n in wanted)
+    cut_off = False
+    if needs_data and isfunction(getattr(day_module, "preprocess", None)):
         logger.debug("Preprocessing data")
-        data = day_module.preprocess()
+        data, phase = preprocess_with_cache(
+            instrumented("preprocess", day_module.preprocess),
+            year,
+            day,
+            context_cache,
+            input_hash,
+            source_hash,
+            memory=memory,
+        )
+        phases.append(phase)
 
-    start = time.perf_counter()
-    end = None
-    if part is None or part == 1:
-        subpart = "a"
-        if not isfunction(getattr(day_module, "part1", None)):
+    for n, subpart in ((1, "a"), (2, "b")):
+        if part is not None and part != n:
+            continue
+        if not isfunction(getattr(day_module, f"part{n}", None)):
             logger.error(
-                f"part 1 was specified but is not a function in {day_module.__name__}"
+                f"part {n} was specified but is not a function in {day_module.__name__}"
             )
             sys.exit(1)
+        answer = cached.get(n)
+        if answer is not None:
+            logger.success(f"Part {n}: {answer} (cached)")
+        elif limits:
+            from .limits import solve_part_limited
 
-        answer = day_module.part1(data)
-        logger.success(f"Part 1: {answer}")
-        if do_submit and part == 1:
-            end = time.perf_counter()
-            logger.debug(
-                f"submitting answer={answer}, day={day}, year={year}, part={subpart}"
+            outcome = solve_part_limited(
+                year, day, n, text, limits, memory, context_cache
             )
-            import aocd
-
-            aocd.submit(answer=answer, day=day, year=year, part=subpart)
-            logger.success(f"done")
-    if part is None or part == 2:
-        subpart = "b"
-        if not isfunction(getattr(day_module, "part2", None)):
-            logger.error(
-                f"part 2 was specified but is not a function in {day_module.__name__}"
+            phases.extend(outcome.phases)
+            if not outcome.ok:
+                logger.error(outcome.describe(limits))
+                cut_off = True
+                continue
+            answer = outcome.answer
+            logger.success(f"Part {n}: {answer}")
+            if cache:
+                cache.put(
+                    year,
+                    day,
+                    n,
+                    input_hash,
+                    source_hash,
+                    answer,
+                    outcome.phases[-1].elapsed,
+                )
+        else:
+            answer, phase = measure(
+                f"part{n}",
+                instrumented(f"part{n}", solvers[n]),
+                data,
+                memory=memory,
             )
-            sys.exit(1)
-        answer = day_module.part2(data)
-        logger.success(f"Part 2: {answer}")
-        if do_submit and part == 2:
-            end = time.perf_counter()
+            phases.append(phase)
+            logger.success(f"Part {n}: {answer}")
+            if cache:
+                cache.put(
+                    year, day, n, input_hash, answer_hashes[n], answer, phase.elapsed
+                )
+        if do_submit and part == n:
             logger.debug(
                 f"submitting answer={answer}, day={day}, year={year}, part={subpart}"
             )
             import aocd
 
-            aocd.submit(answer=answer, day=day, year=year, part=subpart)
+            _, phase = measure(
+                "submit",
+                instrumented("submit", aocd.submit),
+                answer=answer,
+                day=day,
+                year=year,
+                part=subpart,
+                memory=memory,
+            )
+            phases.append(phase)
             logger.success(f"done")
     if part == 0:
-        if not isfunction(getattr(day_module, "test", None)):
+        from .testing import format_summary, run_module_cases
+
+        if not getattr(day_module, "tests", None):
             logger.error(
-                f"part 0 was specified but there is no test function in {day_module.__name__}"
+                f"part 0 was specified but there is no tests list in {day_module.__name__}"
             )
             sys.exit(1)
-        answer = day_module.test(data)
-        logger.success(f"Test returns {answer}")
-    if end is None:
-        end = time.perf_counter()
-    logger.success(f"Time elapsed: {end - start}s")
+        results, phase = measure(
+            "test", run_module_cases, day_module.__name__, memory=memory
+        )
+        phases.append(phase)
+        logger.success(format_summary(results, slowest=0))
+    if phases:
+        for line in format_phases(phases):
+            logger.success(line)
+    solve_time = sum(p.elapsed for p in phases if p.name != "submit")
+    logger.success(f"Time elapsed: {solve_time}s")
+    if trace_out:
+        from aoc_common.trace import stop_tracing, write_trace
+
+        events = stop_tracing()
+        write_trace(events, Path(trace_out))
+        logger.success(f"Wrote {len(events)} spans to {trace_out}")
+    if cut_off:
+        sys.exit(1)
+
+
+@aoc.command()
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    multiple=True,
+    type=int,
+    help="Only benchmark this year (repeatable, default all)",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    multiple=True,
+    type=int,
+    help="Only benchmark this day (repeatable, default all)",
+)
+@click.option("-p", "--part", default=None, type=int, help="Only benchmark this part")
+@click.option("-n", "--repeat", default=5, type=int, help="Timed repetitions per phase")
+@click.option(
+    "-w", "--warmup", default=1, type=int, help="Untimed repetitions before timing"
+)
+@click.option(
+    "--json",
+    "json_file",
+    default=None,
+    type=click.File("w"),
+    help="Also write results as JSON to this file ('-' for stdout)",
+)
+@click.option(
+    "-m",
+    "--memory",
+    default=None,
+    type=click.Choice(MEMORY_MODES),
+    help="Also measure peak memory per phase, in one extra untimed run",
+)
+@click.option(
+    "--save",
+    "save_path",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Save medians (and memory, with --memory) as a baseline JSON file",
+)
+@click.option(
+    "--compare",
+    "compare_path",
+    default=None,
+    type=click.Path(dir_okay=False, exists=True),
+    help="Compare against a saved baseline and exit nonzero on regressions, errors or phases that stop reporting",
+)
+@click.option(
+    "--threshold",
+    default=0.1,
+    type=float,
+    help="Fractional slowdown of a median that counts as a regression",
+)
+@click.option(
+    "--min-time",
+    default=0.001,
+    type=float,
+    help="Ignore changes in phases whose medians are both below this many seconds",
+)
+def bench(
+    years: Tuple[int],
+    days: Tuple[int],
+    part: int,
+    repeat: int,
+    warmup: int,
+    json_file: IO,
+    memory: str,
+    save_path: str,
+    compare_path: str,
+    threshold: float,
+    min_time: float,
+):
+    import json
+
+    from .baseline import (
+        FAILING,
+        compare,
+        format_comparison,
+        has_entries,
+        load_baseline,
+        make_baseline,
+        save_baseline,
+    )
+    from .bench import DayBench, bench_day, format_table
+    from .days import discover_days, load_input
+
+    parts = (1, 2) if part is None else (part,)
+    baseline = None
+    if compare_path:
+        try:
+            baseline = load_baseline(Path(compare_path))
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--compare'")
+    results = []
+    for year, day in discover_days(years, days):
+        text = load_input(year, day)
+        if text is None:
+            # a baseline day that can't run anymore has to fail the comparison, not vanish from it
+            if baseline and has_entries(baseline, year, day):
+                results.append(DayBench(year, day, error="no input"))
+            continue
+        logger.info(f"Benchmarking year={year} day={day}")
+        results.append(bench_day(year, day, text, repeat, warmup, parts, memory))
+    if not results:
+        logger.error("Nothing was benchmarked")
+        sys.exit(1)
+    click.echo(format_table(results))
+    if json_file:
+        json.dump(
+            {
+                "repeat": repeat,
+                "warmup": warmup,
+                "results": [r.as_dict() for r in results],
+            },
+            json_file,
+            indent=2,
+        )
+        json_file.write("\n")
+    if save_path:
+        save_baseline(make_baseline(results, repeat, warmup), Path(save_path))
+        logger.success(f"Saved baseline to {save_path}")
+    if baseline:
+        phases = ("preprocess",) + tuple(f"part{p}" for p in parts)
+        comparisons = compare(baseline, results, threshold, min_time, phases)
+        click.echo(format_comparison(comparisons))
+        for c in comparisons:
+            if c.status == "faster":
+                logger.success(f"{c.key} is {c.old / c.new:.2f}x faster than baseline")
+            elif c.status == "slower":
+                logger.error(f"{c.key} is {c.ratio:.2f}x slower than baseline")
+            elif c.status == "missing":
+                logger.error(f"{c.key} is in the baseline but wasn't measured")
+        errors = [r for r in results if r.error]
+        for r in errors:
+            logger.error(f"year={r.year} day={r.day} failed: {r.error}")
+        if errors or any(c.status in FAILING for c in comparisons):
+            sys.exit(1)
+
+
+@aoc.command("log-overhead")
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    multiple=True,
+    type=int,
+    help="Only measure this year (repeatable, default all)",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    multiple=True,
+    type=int,
+    help="Only measure this day (repeatable, default all)",
+)
+@click.option("-p", "--part", default=None, type=int, help="Only measure this part")
+@click.option("-n", "--repeat", default=5, type=int, help="Timed repetitions per phase")
+@click.option(
+    "-w", "--warmup", default=1, type=int, help="Untimed repetitions before timing"
+)
+@click.pass_context
+def log_overhead(
+    ctx: click.Context,
+    years: Tuple[int],
+    days: Tuple[int],
+    part: int,
+    repeat: int,
+    warmup: int,
+):
+    """Benchmark each day with logging off, at the current level, and fully verbose, to show what logging costs."""
+    from .days import discover_days, load_input
+    from .logbench import format_overhead, log_overhead
+
+    parts = (1, 2) if part is None else (part,)
+    results = []
+    for year, day in discover_days(years, days):
+        text = load_input(year, day)
+        if text is None:
+            continue
+        logger.info(f"Measuring logging overhead for year={year} day={day}")
+        results.append(
+            log_overhead(year, day, text, ctx.obj["log_level"], repeat, warmup, parts)
+        )
+    if not results:
+        logger.error("Nothing was measured")
+        sys.exit(1)
+    click.echo(format_overhead(results))
+
+
+@aoc.command("run-all")
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    multiple=True,
+    type=int,
+    help="Only run this year (repeatable, default all)",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    multiple=True,
+    type=int,
+    help="Only run this day (repeatable, default all)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Worker processes to use (default: one per CPU)",
+)
+@click.option(
+    "-m",
+    "--memory",
+    default=None,
+    type=click.Choice(MEMORY_MODES),
+    help="Also record peak memory per phase",
+)
+@click.option(
+    "--json",
+    "json_file",
+    default=None,
+    type=click.File("w"),
+    help="Also write answers and timings as JSON to this file ('-' for stdout)",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Reuse answers computed earlier for the same input and module source",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Where cached results live (default $AOC_CACHE_DIR, or aoc_cache under $AOCD_DIR)",
+)
+@click.option(
+    "--context-cache",
+    "use_context_cache",
+    is_flag=True,
+    default=False,
+    help="Pickle preprocess() results and reuse them for the same input and module source",
+)
+@click.option(
+    "--timeout",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Kill a part that runs longer than this many seconds. Each part then runs in its own child process",
+)
+@click.option(
+    "--max-memory",
+    default=None,
+    callback=parse_size_option,
+    help="Limit each part's child process to this much address space, e.g. 512M or 2G",
+)
+@click.pass_context
+def run_all(
+    ctx: click.Context,
+    years: Tuple[int],
+    days: Tuple[int],
+    jobs: int,
+    memory: str,
+    json_file: IO,
+    use_cache: bool,
+    cache_dir: str,
+    use_context_cache: bool,
+    timeout: float,
+    max_memory: int,
+):
+    import json
+
+    from .batch import format_results, solve_all
+    from .cache import AnswerCache, ContextCache, default_cache_root
+    from .days import discover_days
+    from .limits import Limits
+
+    to_run = discover_days(years, days)
+    if not to_run:
+        logger.error("No days matched")
+        sys.exit(1)
+    logger.info(f"Running {len(to_run)} days")
+    cache_root = Path(cache_dir) if cache_dir else default_cache_root()
+    cache = AnswerCache(cache_root) if use_cache else None
+    context_cache = ContextCache(cache_root) if use_context_cache else None
+    results = solve_all(
+        to_run,
+        jobs,
+        memory,
+        ctx.obj["log_level"],
+        cache,
+        context_cache,
+        Limits(timeout, max_memory),
+    )
+    click.echo(format_results(results))
+    logger.success(
+        f"Total solve time: {sum(r.solve_time for r in results)}s across {len(results)} days"
+    )
+    if json_file:
+        json.dump([r.as_dict() for r in results], json_file, indent=2)
+        json_file.write("\n")
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+@aoc.command("startup-profile")
+@click.option(
+    "-m",
+    "--module",
+    default=None,
+    help="Profile importing this module instead of running an aoc command",
+)
+@click.option("-n", "--top", default=25, type=int, help="How many modules to list")
+@click.option(
+    "--sort",
+    "sort_by",
+    default="cumulative",
+    type=click.Choice(("cumulative", "self")),
+    help="Rank modules by cumulative or self import time",
+)
+@click.argument("args", nargs=-1)
+def startup_profile(module: str, top: int, sort_by: str, args: Tuple[str]):
+    """Show the -X importtime breakdown for `aoc ARGS` (default: `aoc version`) or for importing --module."""
+    from .importtime import format_profile, profile_imports
+
+    if module:
+        records = profile_imports(["-c", f"import {module}"])
+    else:
+        records = profile_imports(["-m", "aoc_runner.cli", *(args or ("version",))])
+    if not records:
+        logger.error("The profiled interpreter didn't report any imports")
+        sys.exit(1)
+    click.echo(format_profile(records, top, sort_by))
+
+
+@aoc.command()
+@click.option(
+    "-y", "--year", default=2021, type=int, help="Which year's puzzle to generate for"
+)
+@click.option(
+    "-d", "--day", default=1, type=int, help="Which day's puzzle to generate for"
+)
+@click.option(
+    "-s",
+    "--scale",
+    required=True,
+    type=click.IntRange(min=1),
+    help="How big an input to generate. What it counts (lines, grid side, packets...) depends on the day",
+)
+@click.option(
+    "--seed",
+    default=0,
+    type=int,
+    help="Random seed; the same seed gives the same input",
+)
+@click.option(
+    "-o",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="Where to write the input (default stdout)",
+)
+def gen(year: int, day: int, scale: int, seed: int, output: IO):
+    """Generate a synthetic puzzle input from the day module's generate() function."""
+    from .days import load_day, phase_function
+
+    day_module = load_day(year, day)
+    if day_module is None:
+        sys.exit(1)
+    generate = phase_function(day_module, "generate")
+    if generate is None:
+        logger.error(f"{day_module.__name__} has no generate() function")
+        sys.exit(1)
+    output.write(generate(scale, seed))
+
+
+@aoc.command()
+@click.option(
+    "-y", "--year", default=2021, type=int, help="Which year's puzzle to scale"
+)
+@click.option("-d", "--day", default=1, type=int, help="Which day's puzzle to scale")
+@click.option("-p", "--part", default=None, type=int, help="Only time this part")
+@click.option(
+    "--start", default=16, type=click.IntRange(min=1), help="Smallest input size"
+)
+@click.option(
+    "--factor",
+    default=2.0,
+    type=click.FloatRange(min=1, min_open=True),
+    help="How much bigger each input is than the last",
+)
+@click.option(
+    "--steps", default=6, type=click.IntRange(min=2), help="How many sizes to try"
+)
+@click.option("--seed", default=0, type=int, help="Random seed for generated inputs")
+@click.option("-n", "--repeat", default=3, type=int, help="Timed repetitions per size")
+@click.option(
+    "-w", "--warmup", default=1, type=int, help="Untimed repetitions before timing"
+)
+@click.option(
+    "--max-time",
+    default=10.0,
+    type=float,
+    help="Stop growing the input once a phase's median takes longer than this many seconds",
+)
+@click.option(
+    "--json",
+    "json_file",
+    default=None,
+    type=click.File("w"),
+    help="Also write the timings and fitted exponents as JSON to this file ('-' for stdout)",
+)
+def scale(
+    year: int,
+    day: int,
+    part: int,
+    start: int,
+    factor: float,
+    steps: int,
+    seed: int,
+    repeat: int,
+    warmup: int,
+    max_time: float,
+    json_file: IO,
+):
+    """Time a day on geometrically growing inputs and fit how its runtime grows with input size.
+
+    Inputs come from the day's generate() function if it has one, otherwise from truncating the real input.
+    """
+    import json
+
+    from .scaling import format_scaling, geometric_sizes, scale_day
+
+    parts = (1, 2) if part is None else (part,)
+    sizes = geometric_sizes(start, factor, steps)
+    run = scale_day(year, day, sizes, seed, repeat, warmup, parts, max_time)
+    if len(run.points) < 2:
+        logger.error(
+            f"Only {len(run.points)} input sizes ran, which isn't enough to fit anything"
+        )
+        sys.exit(1)
+    click.echo(format_scaling(run))
+    if json_file:
+        json.dump(run.as_dict(), json_file, indent=2)
+        json_file.write("\n")
+
+
+@aoc.command()
+@click.option(
+    "-y", "--year", default=2021, type=int, help="Which year's puzzle to compare"
+)
+@click.option("-d", "--day", default=1, type=int, help="Which day's puzzle to compare")
+@click.option(
+    "-p", "--part", default=None, type=int, help="Only compare this part's variants"
+)
+@click.option(
+    "-n", "--repeat", default=5, type=int, help="Timed repetitions per variant"
+)
+@click.option(
+    "-w", "--warmup", default=1, type=int, help="Untimed repetitions before timing"
+)
+@click.option(
+    "-m",
+    "--memory",
+    default=None,
+    type=click.Choice(MEMORY_MODES),
+    help="Also measure each variant's peak memory, in one extra untimed run",
+)
+@click.option(
+    "--json",
+    "json_file",
+    default=None,
+    type=click.File("w"),
+    help="Also write results as JSON to this file ('-' for stdout)",
+)
+@click.argument(
+    "_input", metavar="INPUT", default=None, required=False, type=click.File(), nargs=1
+)
+def compare(
+    year: int,
+    day: int,
+    part: int,
+    repeat: int,
+    warmup: int,
+    memory: str,
+    json_file: IO,
+    _input: IO,
+):
+    """Run every registered variant of a day's parts on the same input and rank them.
+
+    Exits nonzero if any variant's answer disagrees with the default implementation's.
+    """
+    import json
+
+    from .days import load_input
+    from .variants import compare_variants, format_variants
+
+    text = _input.read() if _input is not None else load_input(year, day)
+    if text is None:
+        sys.exit(1)
+    report = {}
+    for n in (1, 2):
+        if part is not None and part != n:
+            continue
+        results = compare_variants(year, day, n, text, repeat, warmup, memory)
+        if not results:
+            logger.error(f"year={year} day={day} has no part{n}")
+            continue
+        click.echo(f"part{n}:")
+        click.echo(format_variants(results))
+        report[f"part{n}"] = results
+    if json_file:
+        json.dump(
+            {k: [r.as_dict() for r in v] for k, v in report.items()},
+            json_file,
+            indent=2,
+        )
+        json_file.write("\n")
+    if any(r.agrees is False for results in report.values() for r in results):
+        logger.error("Variants disagree about the answer")
+        sys.exit(1)
+
+
+@aoc.command()
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    multiple=True,
+    type=int,
+    help="Only tune this year (repeatable, default all)",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    multiple=True,
+    type=int,
+    help="Only tune this day (repeatable, default all)",
+)
+@click.option("-p", "--part", default=None, type=int, help="Only tune this part")
+@click.option(
+    "-s",
+    "--scale",
+    "scales",
+    multiple=True,
+    type=click.IntRange(min=1),
+    help="Calibrate on generated inputs of this scale (repeatable) instead of the real input",
+)
+@click.option("--seed", default=0, type=int, help="Random seed for generated inputs")
+@click.option(
+    "-n", "--repeat", default=3, type=int, help="Timed repetitions per variant"
+)
+@click.option(
+    "-w", "--warmup", default=1, type=int, help="Untimed repetitions before timing"
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Where the tuning database lives (default $AOC_CACHE_DIR, or aoc_cache under $AOCD_DIR)",
+)
+@click.option(
+    "--show",
+    is_flag=True,
+    default=False,
+    help="Only list the stored choices, without calibrating",
+)
+def tune(
+    years: Tuple[int],
+    days: Tuple[int],
+    part: int,
+    scales: Tuple[int],
+    seed: int,
+    repeat: int,
+    warmup: int,
+    cache_dir: str,
+    show: bool,
+):
+    """Time every variant of each part and remember the fastest per input size, for `aoc run` to use."""
+    from .cache import default_cache_root
+    from .days import discover_days, load_day, load_input, phase_function
+    from .tuning import TuningStore, format_choices, size_bucket, tune_part, tuning_path
+
+    cache_root = Path(cache_dir) if cache_dir else default_cache_root()
+    store = TuningStore(tuning_path(cache_root))
+    tuned = []
+    for year, day in discover_days(years, days):
+        day_module = load_day(year, day)
+        if day_module is None or not getattr(day_module, "variants", None):
+            continue
+        tuned.append((year, day))
+        if show:
+            continue
+        generate = phase_function(day_module, "generate")
+        if scales and generate is None:
+            logger.warning(
+                f"year={year} day={day} has no generate(), calibrating on the real input"
+            )
+        if scales and generate is not None:
+            texts = [generate(s, seed) for s in scales]
+        else:
+            texts = [load_input(year, day)]
+        for text in texts:
+            if text is None:
+                continue
+            for n in (1, 2):
+                if part is not None and part != n:
+                    continue
+                if f"part{n}" not in day_module.variants:
+                    continue
+                _, winner = tune_part(store, year, day, n, text, repeat, warmup)
+                bucket = f"2^{size_bucket(text)} bytes"
+                if winner is None:
+                    logger.error(
+                        f"year={year} day={day} part{n} ({bucket}): no variant agreed with the default"
+                    )
+                else:
+                    logger.success(
+                        f"year={year} day={day} part{n} ({bucket}): {winner.name} in {winner.total:.6f}s"
+                    )
+    choices = [c for c in store.choices() if (c.year, c.day) in tuned]
+    store.close()
+    click.echo(format_choices(choices))
+
+
+@aoc.command("pack-inputs")
+@click.option(
+    "--from",
+    "source",
+    default=None,
+    type=click.Path(file_okay=False, exists=True),
+    help="Directory of aocd's cached inputs to pack, as USER/YYYY_DD_input.txt (default $AOCD_DIR)",
+)
+@click.option(
+    "--store-dir",
+    default=None,
+    type=click.Path(file_okay=False),
+    help="Where the packed store lives (default aoc_store under $AOCD_DIR)",
+)
+@click.option(
+    "--verify", is_flag=True, default=False, help="Only check every stored input's hash"
+)
+@click.option(
+    "--list",
+    "list_entries",
+    is_flag=True,
+    default=False,
+    help="Only list what the store holds",
+)
+def pack_inputs(source: str, store_dir: str, verify: bool, list_entries: bool):
+    """Pack cached puzzle inputs into one memory-mapped file, so later runs read them without aocd."""
+    from .store import InputStore, default_aocd_dir, default_store_root, scan_aocd_dir
+
+    store = InputStore(Path(store_dir) if store_dir else default_store_root())
+    if verify:
+        bad = store.verify()
+        for key in bad:
+            logger.error(f"{key} does not match its recorded hash")
+        logger.success(
+            f"{len(store.index) - len(bad)} of {len(store.index)} inputs verified"
+        )
+        sys.exit(1 if bad else 0)
+    if list_entries:
+        for key, entry in sorted(store.index.items()):
+            click.echo(f"{key:<40} {entry.length:>8} bytes  {entry.sha256[:12]}")
+        return
+    found = [
+        # aocd strips trailing newlines from what it returns, so store what it would return
+        (year, day, user, path.read_bytes().rstrip(b"\r\n"))
+        for year, day, user, path in scan_aocd_dir(
+            Path(source) if source else default_aocd_dir()
+        )
+    ]
+    changed = store.pack(found)
+    logger.success(
+        f"Packed {len(found)} inputs ({changed} new or changed) into {store.pack_path}, "
+        f"{len(store.index)} in total"
+    )
+
+
+@aoc.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Where to listen (default $AOC_SOCKET, or aoc-UID.sock in the temp directory)",
+)
+@click.option(
+    "--contexts-per-day",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Parsed inputs to keep resident for each day, dropping the least recently used",
+)
+def serve(socket_path: str, contexts_per_day: int):
+    """Keep day modules imported and contexts parsed in a long-lived process for `aoc run --via-daemon`."""
+    from .daemon import AlreadyRunning, default_socket_path, serve
+
+    try:
+        serve(
+            Path(socket_path) if socket_path else default_socket_path(),
+            contexts_per_day,
+        )
+    except AlreadyRunning as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+
+@aoc.command()
+@click.option(
+    "-y",
+    "--year",
+    "years",
+    multiple=True,
+    type=int,
+    help="Only test this year (repeatable, default all)",
+)
+@click.option(
+    "-d",
+    "--day",
+    "days",
+    multiple=True,
+    type=int,
+    help="Only test this day (repeatable, default all)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Worker processes to use (default: one per CPU)",
+)
+@click.option(
+    "--slowest",
+    default=10,
+    type=int,
+    help="How many of the slowest test cases to list",
+)
+@click.option(
+    "--json",
+    "json_file",
+    default=None,
+    type=click.File("w"),
+    help="Also write every case's result as JSON to this file ('-' for stdout)",
+)
+@click.pass_context
+def test(
+    ctx: click.Context,
+    years: Tuple[int],
+    days: Tuple[int],
+    jobs: int,
+    slowest: int,
+    json_file: IO,
+):
+    """Run the examples in every module's tests list in parallel, without stopping at the first failure."""
+    import json
+
+    from .days import discover_days
+    from .testing import collect_cases, format_summary, run_cases
+
+    cases = collect_cases(discover_days(years, days))
+    if not cases:
+        logger.error("No test cases found")
+        sys.exit(1)
+    logger.info(f"Running {len(cases)} test cases")
+    results = run_cases(cases, jobs, ctx.obj["log_level"])
+    click.echo(format_summary(results, slowest))
+    if json_file:
+        json.dump([r.as_dict() for r in results], json_file, indent=2)
+        json_file.write("\n")
+    if not all(r.passed for r in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+import copy
+import errno
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Tuple
+
+from loguru import logger
+
+from .cache import local_sources, module_hash, text_hash
+from .days import input_override, phase_function
+
+
+def default_socket_path() -> Path:
+    if os.getenv("AOC_SOCKET"):
+        return Path(os.getenv("AOC_SOCKET")).expanduser()
+    return Path(tempfile.gettempdir()) / f"aoc-{os.getuid()}.sock"
+
+
+# parsed inputs kept per day; the least recently used goes first
+CONTEXTS_PER_DAY = 4
+
+
+def _reload_with_helpers(module: ModuleType) -> ModuleType:
+    """Reload module after reloading the repo-local modules it imports, so edits to shared helpers take effect too."""
+    _, paths = local_sources(module)
+    helpers = set(paths) - {Path(module.__file__).resolve()}
+    for helper in list(sys.modules.values()):
+        path = getattr(helper, "__file__", None)
+        if path and Path(path).resolve() in helpers:
+            importlib.reload(helper)
+    return importlib.reload(module)
+
+
+class WarmState:
+    """Day modules and preprocessed contexts kept resident between requests.
+
+    A module is reloaded when the hash of its source and its repo-local imports changes, which also throws away its
+    contexts. Each day keeps at most contexts_per_day of them. Contexts are deep-copied before each part runs, since
+    some parts stash results in them.
+    """
+
+    def __init__(self, contexts_per_day: int = CONTEXTS_PER_DAY):
+        self.contexts_per_day = contexts_per_day
+        self.modules: Dict[Tuple[int, int], Tuple[ModuleType, str]] = {}
+        self.contexts: Dict[Tuple[int, int], "OrderedDict[str, Any]"] = {}
+
+    def module(self, year: int, day: int) -> ModuleType:
+        key = (year, day)
+        if key in self.modules:
+            module, source_hash = self.modules[key]
+            current = module_hash(module)
+            if current == source_hash:
+                return module
+            logger.info(f"{module.__name__} or a module it imports changed, reloading")
+            module = _reload_with_helpers(module)
+            self.contexts.pop(key, None)
+        else:
+            module = importlib.import_module(f".day{day:02}", f"aoc_{year}")
+            current = module_hash(module)
+        self.modules[key] = (module, current)
+        return module
+
+    def context(
+        self, year: int, day: int, module: ModuleType, text: str
+    ) -> Tuple[Any, bool]:
+        """The preprocessed context for text, and whether it was already resident. Call inside input_override."""
+        contexts = self.contexts.setdefault((year, day), OrderedDict())
+        input_hash = text_hash(text)
+        if input_hash in contexts:
+            contexts.move_to_end(input_hash)
+            return contexts[input_hash], True
+        preprocess = phase_function(module, "preprocess")
+        contexts[input_hash] = preprocess() if preprocess else []
+        while len(contexts) > self.contexts_per_day:
+            contexts.popitem(last=False)
+        return contexts[input_hash], False
+
+    def solve(self, year: int, day: int, part: int, text: str) -> Dict:
+        start = time.perf_counter()
+        module = self.module(year, day)
+        solver = phase_function(module, f"part{part}")
+        if solver is None:
+            raise ValueError(f"part {part} is not a function in {module.__name__}")
+        with input_override(text):
+            context, context_cached = self.context(year, day, module, text)
+            answer = solver(copy.deepcopy(context))
+        return {
+            "answer": str(answer),
+            "elapsed": time.perf_counter() - start,
+            "context_cached": context_cached,
+        }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # closed without a request, like another `aoc serve` checking whether this one is alive
+            return
+        try:
+            request = json.loads(line)
+            logger.info(
+                f"request year={request['year']} day={request['day']} part={request['part']}"
+            )
+            response = self.server.state.solve(
+                int(request["year"]),
+                int(request["day"]),
+                int(request["part"]),
+                request["input"],
+            )
+        except Exception as e:
+            logger.exception("request failed")
+            response = {"error": repr(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class WarmServer(socketserver.UnixStreamServer):
+    """Serves one request at a time, because solving patches aocd.get_data for the whole process."""
+
+    def __init__(self, path: Path, contexts_per_day: int = CONTEXTS_PER_DAY):
+        self.state = WarmState(contexts_per_day)
+        super().__init__(str(path), RequestHandler)
+
+
+class AlreadyRunning(Exception):
+    pass
+
+
+def _is_listening(path: Path) -> bool:
+    """Whether something accepts connections on path. A refused connection means a socket file left behind by a
+    daemon that didn't shut down cleanly."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError as e:
+            if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+                return False
+            raise
+    return True
+
+
+def serve(path: Path, contexts_per_day: int = CONTEXTS_PER_DAY):
+    if path.exists():
+        if _is_listening(path):
+            raise AlreadyRunning(f"A daemon is already listening on {path}")
+        path.unlink()
+    with WarmServer(path, contexts_per_day) as server:
+        logger.success(f"Listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.success("Shutting down")
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def request(path: Path, year: int, day: int, part: int, text: str) -> Dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        payload = {"year": year, "day": day, "part": part, "input": text}
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
@@ -0,0 +1,94 @@
+import importlib
+import pkgutil
+import re
+from contextlib import contextmanager
+from inspect import isfunction
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+ROOT = Path(__file__).resolve().parent.parent
+YEAR_PATTERN = re.compile(r"^aoc_(\d{4})$")
+DAY_PATTERN = re.compile(r"^day(\d\d)$")
+PHASES = ("preprocess", "part1", "part2")
+
+
+def discover_days(
+    years: Iterable[int] = (), days: Iterable[int] = ()
+) -> List[Tuple[int, int]]:
+    """Find every aoc_YYYY/dayNN module in the tree, optionally filtered by year and day.
+
+    Only modules named exactly dayNN count. Alternates like day20_slow or day04reddit are skipped.
+    """
+    years = set(years)
+    days = set(days)
+    found = []
+    for package in pkgutil.iter_modules([str(ROOT)]):
+        m = YEAR_PATTERN.match(package.name)
+        if not package.ispkg or not m:
+            continue
+        year = int(m.group(1))
+        if years and year not in years:
+            continue
+        for module in pkgutil.iter_modules([str(ROOT / package.name)]):
+            dm = DAY_PATTERN.match(module.name)
+            if not dm:
+                continue
+            day = int(dm.group(1))
+            if days and day not in days:
+                continue
+            found.append((year, day))
+    return sorted(found)
+
+
+def load_day(year: int, day: int) -> Optional[ModuleType]:
+    try:
+        return importlib.import_module(f".day{day:02}", f"aoc_{year}")
+    except (ImportError, SystemExit) as e:
+        logger.error(f"No module could be loaded for year={year} day={day}: {e}")
+        return None
+
+
+def load_input(year: int, day: int) -> Optional[str]:
+    """The puzzle input from the packed input store if it has one, otherwise from aocd."""
+    from .store import default_store
+
+    store = default_store()
+    if store is not None:
+        text = store.get(year, day)
+        if text is not None:
+            return text
+    import aocd
+
+    try:
+        return aocd.get_data(day=day, year=year)
+    except Exception as e:
+        logger.warning(f"Unable to get input for year={year} day={day}: {e}")
+        return None
+
+
+def phase_function(day_module: ModuleType, phase: str) -> Optional[Callable]:
+    fn = getattr(day_module, phase, None)
+    return fn if isfunction(fn) else None
+
+
+@contextmanager
+def input_override(text: str, path: Optional[Path] = None):
+    """Make aocd.get_data() return text instead of the user's puzzle input until the block exits.
+
+    If text was read from path, day modules that stream their input with aoc_common.inputs read the file directly,
+    unless something like a module's test() has replaced aocd.get_data again in the meantime.
+    """
+    import aocd
+
+    from aoc_common.inputs import input_file
+
+    original = aocd.get_data
+    aocd.get_data = get_data = lambda *_, **__: text
+    try:
+        with input_file(path, get_data):
+            yield
+    finally:
+        aocd.get_data = original
@@ -0,0 +1,52 @@
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Sequence
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, module = m.groups()
+            # python indents nested imports by two spaces per level, after one separating space
+            depth = (len(indent) - 1) // 2
+            records.append(
+                ImportRecord(module, int(self_us), int(cumulative_us), depth)
+            )
+    return records
+
+
+def profile_imports(args: Sequence[str]) -> List[ImportRecord]:
+    """Run the interpreter with -X importtime and the given arguments, returning what it imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def format_profile(records: List[ImportRecord], top: int = 20, by: str = "cumulative"):
+    total = sum(r.cumulative_us for r in records if r.depth == 0)
+    key = (lambda r: r.self_us) if by == "self" else (lambda r: r.cumulative_us)
+    header = f"{'self ms':>9} {'cumul ms':>9}  module"
+    lines = [header, "-" * len(header)]
+    for r in sorted(records, key=key, reverse=True)[:top]:
+        lines.append(
+            f"{r.self_us / 1000:>9.1f} {r.cumulative_us / 1000:>9.1f}  {'  ' * r.depth}{r.module}"
+        )
+    lines.append(f"{len(records)} modules imported in {total / 1000:.1f}ms")
+    return "\n".join(lines)
@@ -0,0 +1,257 @@
+import faulthandler
+import multiprocessing
+import os
+import re
+import signal
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from .cache import ContextCache, module_hash, preprocess_with_cache, text_hash
+from .days import ROOT, input_override, load_day, phase_function
+from .phases import PhaseResult, format_bytes, measure, rss_high_water
+
+SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.IGNORECASE)
+TRACEBACK_FRAME = re.compile(r'File "(.+)", line (\d+) in (\S+)')
+
+
+def parse_size(text: str) -> int:
+    """Bytes in a size like 512M, 2G or 1.5GiB. Suffixes are powers of 1024."""
+    m = SIZE_PATTERN.match(text)
+    if not m:
+        raise ValueError(f"{text!r} is not a size like 512M or 2G")
+    number, unit = m.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
+
+
+@dataclass
+class Limits:
+    timeout: Optional[float] = None
+    max_memory: Optional[int] = None
+
+    def __bool__(self):
+        return self.timeout is not None or self.max_memory is not None
+
+
+@dataclass
+class PartOutcome:
+    """What happened to one part run under limits.
+
+    status is ok, timeout, memory (it raised MemoryError under the address space limit), killed (the child died
+    from a signal, e.g. the kernel's OOM killer) or error. phase is whatever was running when it stopped, and where
+    is the innermost puzzle frame at the moment a timeout fired.
+    """
+
+    part: int
+    status: str = "ok"
+    answer: Optional[str] = None
+    phases: List[PhaseResult] = field(default_factory=list)
+    phase: Optional[str] = None
+    elapsed: float = 0
+    where: Optional[str] = None
+    peak_rss: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def describe(self, limits: Limits) -> str:
+        where = f" at {self.where}" if self.where else ""
+        if self.status == "timeout":
+            return (
+                f"part{self.part} hit the {limits.timeout}s timeout during {self.phase}{where}, "
+                f"after finishing {', '.join(p.name for p in self.phases) or 'nothing'}"
+            )
+        if self.status == "memory":
+            return (
+                f"part{self.part} hit the {format_bytes(limits.max_memory)} memory limit during {self.phase} "
+                f"after {self.elapsed:.3f}s (peak RSS {format_bytes(self.peak_rss)})"
+            )
+        if self.status == "killed":
+            return f"part{self.part} was killed during {self.phase} after {self.elapsed:.3f}s: {self.error}"
+        if self.status == "error":
+            return f"part{self.part} failed during {self.phase}: {self.error}"
+        return f"part{self.part}: {self.answer}"
+
+
+def _apply_memory_limit(max_memory: int):
+    import resource
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_memory = min(max_memory, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, hard))
+
+
+def _lift_memory_limit():
+    import resource
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+
+
+def _solve_part_child(
+    conn,
+    year: int,
+    day: int,
+    part: int,
+    text: str,
+    max_memory: Optional[int],
+    trace_fd: int,
+    memory: Optional[str],
+    context_cache: Optional[ContextCache],
+):
+    faulthandler.register(signal.SIGUSR1, file=trace_fd, all_threads=False)
+    if max_memory:
+        _apply_memory_limit(max_memory)
+    phase = "import"
+    out_of_memory = False
+    try:
+        day_module = load_day(year, day)
+        if day_module is None:
+            conn.send(("error", phase, "module could not be loaded"))
+            return
+        solver = phase_function(day_module, f"part{part}")
+        if solver is None:
+            conn.send(("error", phase, f"part{part} is not a function"))
+            return
+        phases = []
+        data = []
+        with input_override(text):
+            preprocess = phase_function(day_module, "preprocess")
+            if preprocess:
+                phase = "preprocess"
+                conn.send(("phase", phase, phases))
+                data, result = preprocess_with_cache(
+                    preprocess,
+                    year,
+                    day,
+                    context_cache,
+                    text_hash(text),
+                    module_hash(day_module),
+                    memory=memory,
+                )
+                phases.append(result)
+            phase = f"part{part}"
+            conn.send(("phase", phase, phases))
+            answer, result = measure(phase, solver, data, memory=memory)
+            phases.append(result)
+        conn.send(("done", str(answer), phases))
+    except MemoryError:
+        out_of_memory = True
+    except Exception as e:
+        conn.send(("error", phase, repr(e)))
+    if out_of_memory:
+        # Replying allocates too, so it can't happen under the limit that just ran out. By now the traceback, and
+        # with it the solver's frames, is gone. Drop the context as well, and lift the limit back to the hard one.
+        data = None
+        _lift_memory_limit()
+        conn.send(("memory", phase, rss_high_water()))
+
+
+def _innermost_frame(traceback: str) -> Optional[str]:
+    """The innermost frame of a faulthandler dump, preferring frames from this repo over library code."""
+    frames = TRACEBACK_FRAME.findall(traceback)
+    for filename, lineno, name in frames:
+        try:
+            relative = Path(filename).resolve().relative_to(ROOT)
+        except ValueError:
+            continue
+        if relative.parts[0] != "aoc_runner":
+            return f"{name} ({relative}:{lineno})"
+    if frames:
+        filename, lineno, name = frames[0]
+        return f"{name} ({Path(filename).name}:{lineno})"
+    return None
+
+
+def solve_part_limited(
+    year: int,
+    day: int,
+    part: int,
+    text: str,
+    limits: Limits,
+    memory: Optional[str] = None,
+    context_cache: Optional[ContextCache] = None,
+) -> PartOutcome:
+    """Preprocess and solve one part in a forked child, under an address space limit and a kill timer.
+
+    When the timer fires, the child is first asked to dump its stack through faulthandler, so the outcome can say
+    where the solver was stuck.
+    """
+    outcome = PartOutcome(part)
+    mp = multiprocessing.get_context("fork")
+    receiver, sender = mp.Pipe(duplex=False)
+    with tempfile.TemporaryFile("w+") as trace:
+        child = mp.Process(
+            target=_solve_part_child,
+            args=(
+                sender,
+                year,
+                day,
+                part,
+                text,
+                limits.max_memory,
+                trace.fileno(),
+                memory,
+                context_cache,
+            ),
+        )
+        start = time.perf_counter()
+        child.start()
+        sender.close()
+        deadline = start + limits.timeout if limits.timeout else None
+        while True:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                outcome.status = "timeout"
+                outcome.where = _dump_and_kill(child, trace)
+                break
+            if not receiver.poll(remaining):
+                continue
+            try:
+                kind, *payload = receiver.recv()
+            except EOFError:
+                child.join()
+                outcome.status = "killed"
+                outcome.error = (
+                    f"signal {signal.Signals(-child.exitcode).name}"
+                    if child.exitcode and child.exitcode < 0
+                    else f"exit code {child.exitcode}"
+                )
+                break
+            if kind == "phase":
+                outcome.phase, outcome.phases = payload
+                logger.debug(f"year={year} day={day} part{part}: {outcome.phase}")
+                continue
+            if kind == "done":
+                outcome.answer, outcome.phases = payload
+            elif kind == "memory":
+                outcome.status = "memory"
+                outcome.phase, outcome.peak_rss = payload
+            else:
+                outcome.status = "error"
+                outcome.phase, outcome.error = payload
+            break
+        outcome.elapsed = time.perf_counter() - start
+        child.join()
+        receiver.close()
+    return outcome
+
+
+def _dump_and_kill(child, trace) -> Optional[str]:
+    os.kill(child.pid, signal.SIGUSR1)
+    # the dump is written from the child's signal handler, so it shows up almost at once
+    for _ in range(50):
+        if os.fstat(trace.fileno()).st_size:
+            break
+        time.sleep(0.01)
+    child.kill()
+    child.join()
+    trace.seek(0)
+    return _innermost_frame(trace.read())
@@ -0,0 +1,82 @@
+import sys
+from contextlib import contextmanager
+from typing import Dict, List
+
+from loguru import logger
+
+from aoc_common.log import OFF, set_level
+
+from .bench import DayBench, bench_day
+from .days import PHASES
+
+LOG_MODES = ("off", "default", "verbose")
+
+
+def _discard(message):
+    pass
+
+
+@contextmanager
+def logging_mode(mode: str, level: str):
+    """Configure loguru and the facade for one measurement, then go back to logging to stderr at level.
+
+    default is the runner's usual setup with messages discarded instead of written. verbose emits every level,
+    so it shows the full cost of formatting. off removes every handler, so direct loguru calls return on loguru's
+    first check, and switches the facade to its no-op methods.
+    """
+    logger.remove()
+    if mode == "default":
+        logger.add(_discard, level=level)
+        set_level(level)
+    elif mode == "verbose":
+        logger.add(_discard, level="TRACE")
+        set_level("TRACE")
+    else:
+        set_level(OFF)
+    try:
+        yield
+    finally:
+        logger.remove()
+        logger.add(sys.stderr, level=level)
+        set_level(level)
+
+
+def log_overhead(
+    year: int,
+    day: int,
+    text: str,
+    level: str = "SUCCESS",
+    repeat: int = 5,
+    warmup: int = 1,
+    parts=(1, 2),
+) -> Dict[str, DayBench]:
+    results = {}
+    for mode in LOG_MODES:
+        with logging_mode(mode, level):
+            results[mode] = bench_day(year, day, text, repeat, warmup, parts)
+    return results
+
+
+def format_overhead(results: List[Dict[str, DayBench]]) -> str:
+    """Medians per logging mode, with the time each mode adds over logging switched off."""
+    header = f"{'year':>4} {'day':>3} {'phase':<10} {'off':>10} {'default':>18} {'verbose':>18}"
+    lines = [header, "-" * len(header)]
+    for by_mode in results:
+        off = by_mode["off"]
+        if off.error and not off.phases:
+            lines.append(f"{off.year:>4} {off.day:>3} error: {off.error}")
+            continue
+        for phase in PHASES:
+            if phase not in off.phases:
+                continue
+            base = off.phases[phase].median
+            cells = [f"{base:>10.6f}"]
+            for mode in ("default", "verbose"):
+                stats = by_mode[mode].phases.get(phase)
+                if stats is None:
+                    cells.append(f"{'-':>18}")
+                    continue
+                extra = (stats.median - base) / base if base else 0
+                cells.append(f"{stats.median:>10.6f} {extra:>+7.1%}")
+            lines.append(f"{off.year:>4} {off.day:>3} {phase:<10} " + " ".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,80 @@
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+MEMORY_MODES = ("tracemalloc", "rss")
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    elapsed: float
+    peak_memory: Optional[int] = None
+
+
+def rss_high_water() -> int:
+    """The process's peak resident set size so far, in bytes."""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS reports bytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def measure(
+    name: str, fn: Callable, *args, memory: Optional[str] = None, **kwargs
+) -> Tuple[Any, PhaseResult]:
+    """Call fn(*args, **kwargs), timing it and optionally tracking its peak memory.
+
+    With memory="tracemalloc", peak_memory is the most python-allocated memory held at once during the call,
+    above what was already allocated when it started. With memory="rss", it is how far the call raised the
+    process's RSS high-water mark. That's cheaper, but a phase that stays under an earlier phase's peak shows 0.
+    """
+    started_tracing = False
+    baseline = 0
+    if memory == "rss":
+        baseline = rss_high_water()
+    if memory == "tracemalloc":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if memory == "tracemalloc":
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            if started_tracing:
+                tracemalloc.stop()
+        elif memory == "rss":
+            peak = rss_high_water() - baseline
+    return result, PhaseResult(name, elapsed, peak)
+
+
+def format_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.1f}{unit}" if unit != "B" else f"{n}B"
+        n /= 1024
+    return f"{n:.1f}GiB"
+
+
+def format_phases(phases: List[PhaseResult]) -> List[str]:
+    show_memory = any(p.peak_memory is not None for p in phases)
+    header = f"{'phase':<10} {'time':>13}"
+    if show_memory:
+        header += f" {'peak memory':>12}"
+    lines = [header]
+    for p in phases:
+        line = f"{p.name:<10} {p.elapsed:>12.6f}s"
+        if show_memory:
+            line += f" {format_bytes(p.peak_memory):>12}"
+        lines.append(line)
+    return lines
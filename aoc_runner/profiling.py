@@ -0,0 +1,180 @@
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple
+
+from loguru import logger
+
+from .days import ROOT
+
+
+@lru_cache(maxsize=None)
+def frame_label(filename: str, lineno: int, name: str) -> str:
+    try:
+        filename = str(Path(filename).resolve().relative_to(ROOT))
+    except ValueError:
+        filename = Path(filename).name
+    return f"{name} ({filename}:{lineno})"
+
+
+def pstats_label(func: Tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # builtins show up as ('~', 0, '<built-in method ...>')
+        return name
+    return frame_label(filename, lineno, name)
+
+
+def collapse_pstats(
+    stats: Dict, max_depth: int = 64, min_share: float = 1e-7
+) -> Counter:
+    """Approximate collapsed stacks from a cProfile call graph.
+
+    cProfile only records caller/callee pairs, so each function's own time is split across its callers in
+    proportion to the time each caller spent in it. That is the usual compromise flame-graph converters for
+    pstats make, and it is exact whenever a function only has one caller.
+    """
+    children = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, ct) in callers.items():
+            children.setdefault(caller, []).append((func, ct))
+    stacks = Counter()
+
+    def walk(func, path, share):
+        _, _, tt, ct, _ = stats[func]
+        path = path + (pstats_label(func),)
+        scale = share / ct if ct else 0
+        if tt * scale > 0:
+            stacks[";".join(path)] += tt * scale
+        if len(path) >= max_depth or share < min_share:
+            return
+        for child, child_ct in children.get(func, ()):
+            if child not in stats or pstats_label(child) in path:
+                continue
+            walk(child, path, child_ct * scale)
+
+    for func, (_, _, _, ct, callers) in stats.items():
+        # the only caller-less entry besides the profiled call is cProfile turning itself off
+        if not callers and "_lsprof.Profiler" not in func[2]:
+            walk(func, (), ct)
+    return stacks
+
+
+class SamplingProfiler:
+    """Samples one thread's python stack from a background thread at a fixed interval.
+
+    The sampler only runs when the profiled thread gives up the GIL, so the switch interval is lowered to match
+    the sampling interval while profiling.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = None
+        self._root = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and frame is not self._root:
+                code = frame.f_code
+                stack.append(
+                    frame_label(code.co_filename, code.co_firstlineno, code.co_name)
+                )
+                frame = frame.f_back
+            # don't record the profiled thread waiting in __exit__ for this one to finish
+            if stack and not self._stop.is_set():
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        # stacks are recorded up to, but not including, whatever entered the profiler
+        self._root = sys._getframe(1)
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.interval, self._switch_interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self._root = None
+
+
+def write_collapsed(stacks: Counter, path: Path, scale: float = 1):
+    with path.open("w") as f:
+        for stack, weight in sorted(stacks.items()):
+            count = round(weight * scale)
+            if count > 0:
+                f.write(f"{stack} {count}\n")
+
+
+def top_functions(stacks: Counter, top: int) -> Iterable[Tuple[str, float]]:
+    """Functions with the most self weight, i.e. at the leaf of the most samples."""
+    leaves = Counter()
+    for stack, weight in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += weight
+    return leaves.most_common(top)
+
+
+class Profiler:
+    """Wraps phases of a run so each one is profiled on its own and written out under prefix-phase."""
+
+    def __init__(self, mode: str, out_dir: Path, prefix: str, top: int = 15):
+        self.mode = mode
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.top = top
+
+    def wrap(self, phase: str, fn: Callable) -> Callable:
+        def profiled(*args, **kwargs):
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            base = self.out_dir / f"{self.prefix}-{phase}"
+            if self.mode == "cprofile":
+                prof = cProfile.Profile()
+                try:
+                    return prof.runcall(fn, *args, **kwargs)
+                finally:
+                    self._report_cprofile(phase, prof, base)
+            sampler = SamplingProfiler()
+            try:
+                with sampler:
+                    return fn(*args, **kwargs)
+            finally:
+                self._report_sampling(phase, sampler, base)
+
+        return profiled
+
+    def _report_cprofile(self, phase: str, prof: cProfile.Profile, base: Path):
+        stats = pstats.Stats(prof)
+        stats.dump_stats(base.with_suffix(".pstats"))
+        # collapsed stacks want integer weights, so record them in microseconds
+        write_collapsed(
+            collapse_pstats(stats.stats), base.with_suffix(".collapsed"), 1e6
+        )
+        logger.success(f"{phase}: wrote {base}.pstats and {base}.collapsed")
+        hot = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+        for func, (cc, nc, tt, ct, _) in hot[: self.top]:
+            logger.success(
+                f"{phase}: {tt:>10.6f}s self {ct:>10.6f}s cumulative {nc:>9} calls  {pstats_label(func)}"
+            )
+
+    def _report_sampling(self, phase: str, sampler: SamplingProfiler, base: Path):
+        write_collapsed(sampler.stacks, base.with_suffix(".collapsed"))
+        total = sum(sampler.stacks.values())
+        logger.success(f"{phase}: {total} samples, wrote {base}.collapsed")
+        for label, count in top_functions(sampler.stacks, self.top):
+            logger.success(
+                f"{phase}: {count:>7} samples {count / total:>6.1%}  {label}"
+            )
@@ -0,0 +1,155 @@
+import math
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .bench import DayBench, bench_day
+from .days import PHASES, load_day, load_input, phase_function
+
+
+@dataclass
+class ScaleRun:
+    year: int
+    day: int
+    source: str
+    # (size asked for, input bytes, timings). Fits are against the bytes, since a generator's scale can be a grid's
+    # side length, and fitting against that would call a linear solver quadratic.
+    points: List[Tuple[int, int, DayBench]] = field(default_factory=list)
+
+    def medians(self, phase: str) -> List[Tuple[int, float]]:
+        return [
+            (nbytes, bench.phases[phase].median)
+            for _, nbytes, bench in self.points
+            if phase in bench.phases
+        ]
+
+    def exponents(self) -> Dict[str, Optional[float]]:
+        return {
+            phase: fit_exponent(self.medians(phase))
+            for phase in PHASES
+            if any(phase in bench.phases for _, _, bench in self.points)
+        }
+
+    def as_dict(self):
+        return {
+            "year": self.year,
+            "day": self.day,
+            "source": self.source,
+            "points": [
+                {"size": size, "bytes": nbytes, **bench.as_dict()}
+                for size, nbytes, bench in self.points
+            ],
+            "exponents": self.exponents(),
+        }
+
+
+def geometric_sizes(start: int, factor: float, steps: int) -> List[int]:
+    sizes = []
+    for i in range(steps):
+        size = max(1, round(start * factor**i))
+        if not sizes or size > sizes[-1]:
+            sizes.append(size)
+    return sizes
+
+
+def fit_exponent(points: Sequence[Tuple[int, float]]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size), i.e. k in time ~ size^k.
+
+    None when there are fewer than two distinct sizes with a nonzero time to fit.
+    """
+    logs = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len({x for x, _ in logs}) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    sxx = sum((x - mean_x) ** 2 for x, _ in logs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    return sxy / sxx
+
+
+def scaled_inputs(
+    year: int, day: int, sizes: Sequence[int], seed: int = 0
+) -> Tuple[str, List[Tuple[int, Callable[[], str]]]]:
+    """A way to make the input at each size, and where they come from.
+
+    Days with a generate() function get generated inputs, where size is that function's scale. They're made one at
+    a time as they're needed, so a big size isn't generated for nothing and a generator that rejects a size only
+    stops the run there. Otherwise the real input is cut down to its first size lines, which only makes sense for
+    inputs with one record per line; sizes past the end of the input are dropped.
+    """
+    day_module = load_day(year, day)
+    if day_module is None:
+        return "", []
+    generate = phase_function(day_module, "generate")
+    if generate is not None:
+        return "generated", [(size, partial(generate, size, seed)) for size in sizes]
+    text = load_input(year, day)
+    if text is None:
+        return "", []
+    lines = text.splitlines()
+    inputs = [
+        (size, partial("\n".join, lines[:size])) for size in sizes if size < len(lines)
+    ]
+    inputs.append((len(lines), lambda: text))
+    return "truncated", inputs
+
+
+def scale_day(
+    year: int,
+    day: int,
+    sizes: Sequence[int],
+    seed: int = 0,
+    repeat: int = 3,
+    warmup: int = 1,
+    parts=(1, 2),
+    max_time: float = 10,
+) -> ScaleRun:
+    """Benchmark a day at each size in turn, stopping early once any phase's median passes max_time."""
+    source, inputs = scaled_inputs(year, day, sizes, seed)
+    run = ScaleRun(year, day, source)
+    for size, make_input in inputs:
+        try:
+            text = make_input()
+        except Exception as e:
+            logger.warning(
+                f"year={year} day={day} size={size} couldn't be generated: {e!r}"
+            )
+            break
+        logger.info(f"year={year} day={day} size={size} ({len(text.encode())} bytes)")
+        bench = bench_day(year, day, text, repeat, warmup, parts)
+        if bench.error:
+            logger.warning(f"year={year} day={day} size={size} failed: {bench.error}")
+            break
+        run.points.append((size, len(text.encode()), bench))
+        slowest = max(s.median for s in bench.phases.values())
+        if slowest > max_time:
+            logger.warning(
+                f"year={year} day={day} took {slowest:.3f}s at size={size}, not going any bigger"
+            )
+            break
+    return run
+
+
+def format_scaling(run: ScaleRun) -> str:
+    exponents = run.exponents()
+    phases = list(exponents)
+    header = f"{'size':>10} {'bytes':>12} " + " ".join(f"{p:>12}" for p in phases)
+    lines = [
+        f"{run.year} day {run.day} ({run.source} input, n is input bytes)",
+        header,
+        "-" * len(header),
+    ]
+    for size, nbytes, bench in run.points:
+        cells = [
+            f"{bench.phases[p].median:>12.6f}" if p in bench.phases else f"{'':>12}"
+            for p in phases
+        ]
+        lines.append(f"{size:>10} {nbytes:>12} " + " ".join(cells))
+    for phase, k in exponents.items():
+        times = [t for _, t in run.medians(phase)]
+        span = f"{min(times):.6f}s..{max(times):.6f}s" if times else "no timings"
+        fit = f"O(n^{k:.1f})" if k is not None else "O(?)"
+        lines.append(f"{phase} ≈ {fit}  ({span})")
+    return "\n".join(lines)
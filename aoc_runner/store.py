@@ -0,0 +1,175 @@
+import json
+import mmap
+import os
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from .cache import text_hash
+
+STORE_VERSION = 1
+AOCD_INPUT_NAME = re.compile(r"^(\d{4})_(\d\d)_input\.txt$")
+
+
+def default_aocd_dir() -> Path:
+    return Path(os.getenv("AOCD_DIR", "~/.config/aocd")).expanduser()
+
+
+def default_store_root() -> Path:
+    return default_aocd_dir() / "aoc_store"
+
+
+def store_key(year: int, day: int, user: str) -> str:
+    return f"{year}/{day:02}/{user}"
+
+
+@dataclass
+class StoreEntry:
+    year: int
+    day: int
+    user: str
+    offset: int
+    length: int
+    sha256: str
+
+
+def scan_aocd_dir(aocd_dir: Path) -> Iterable[Tuple[int, int, str, Path]]:
+    """(year, day, user, path) for every input aocd has cached, where user is the per-token directory name."""
+    for path in sorted(aocd_dir.glob("*/*_input.txt")):
+        m = AOCD_INPUT_NAME.match(path.name)
+        if m:
+            yield int(m.group(1)), int(m.group(2)), path.parent.name, path
+
+
+class InputStore:
+    """Every puzzle input packed into one file, located through a JSON index of offsets, lengths and hashes.
+
+    Reads go through a single mmap of the pack, so looking up an input costs a dict lookup and a slice rather than
+    an open and read per file, and nothing needs a session token or the network.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.pack_path = root / "inputs.pack"
+        self.index_path = root / "inputs.index.json"
+        self._index: Optional[Dict[str, StoreEntry]] = None
+        self._file = None
+        self._map = None
+
+    @property
+    def index(self) -> Dict[str, StoreEntry]:
+        if self._index is None:
+            try:
+                with self.index_path.open() as f:
+                    raw = json.load(f)
+            except FileNotFoundError:
+                raw = {"version": STORE_VERSION, "entries": {}}
+            if raw.get("version") != STORE_VERSION:
+                raise ValueError(
+                    f"{self.index_path} is store version {raw.get('version')}, expected {STORE_VERSION}"
+                )
+            self._index = {k: StoreEntry(**v) for k, v in raw["entries"].items()}
+        return self._index
+
+    def _bytes(self, entry: StoreEntry) -> bytes:
+        if self._map is None:
+            self._file = self.pack_path.open("rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[entry.offset : entry.offset + entry.length]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = self._file = None
+
+    def users(self, year: int, day: int) -> List[str]:
+        return sorted(
+            e.user for e in self.index.values() if (e.year, e.day) == (year, day)
+        )
+
+    def get(
+        self, year: int, day: int, user: Optional[str] = None, verify: bool = True
+    ) -> Optional[str]:
+        """The input for (year, day, user), or None if the store doesn't have it.
+
+        Without a user, AOC_USER picks one, and otherwise the day must have exactly one user's input.
+        """
+        if user is None:
+            user = os.getenv("AOC_USER")
+        if user is None:
+            users = self.users(year, day)
+            if len(users) != 1:
+                if users:
+                    logger.warning(
+                        f"year={year} day={day} has inputs for {len(users)} users in the store; set AOC_USER to pick one"
+                    )
+                return None
+            user = users[0]
+        entry = self.index.get(store_key(year, day, user))
+        if entry is None:
+            return None
+        data = self._bytes(entry)
+        if verify and text_hash(data) != entry.sha256:
+            logger.error(f"Stored input for {store_key(year, day, user)} is corrupt")
+            return None
+        return data.decode()
+
+    def pack(self, inputs: Iterable[Tuple[int, int, str, bytes]]) -> int:
+        """Merge inputs into the store, rewriting the pack and index. Returns how many entries were new or changed."""
+        contents = {key: self._bytes(e) for key, e in self.index.items()}
+        changed = 0
+        for year, day, user, data in inputs:
+            key = store_key(year, day, user)
+            if contents.get(key) != data:
+                contents[key] = data
+                changed += 1
+        self.close()
+        self.root.mkdir(parents=True, exist_ok=True)
+        index = {}
+        offset = 0
+        tmp_pack = self.pack_path.with_suffix(".tmp")
+        with tmp_pack.open("wb") as f:
+            for key in sorted(contents):
+                data = contents[key]
+                year, day, user = key.split("/", 2)
+                index[key] = StoreEntry(
+                    int(year), int(day), user, offset, len(data), text_hash(data)
+                )
+                f.write(data)
+                offset += len(data)
+        tmp_index = self.index_path.with_suffix(".tmp")
+        with tmp_index.open("w") as f:
+            json.dump(
+                {
+                    "version": STORE_VERSION,
+                    "entries": {k: asdict(v) for k, v in index.items()},
+                },
+                f,
+                indent=1,
+            )
+        # the pack goes first, so a crash in between leaves an index that points into a file it doesn't describe,
+        # which the hashes catch
+        os.replace(tmp_pack, self.pack_path)
+        os.replace(tmp_index, self.index_path)
+        self._index = index
+        return changed
+
+    def verify(self) -> List[str]:
+        """Keys whose bytes no longer match their recorded hash."""
+        return [
+            key
+            for key, entry in self.index.items()
+            if text_hash(self._bytes(entry)) != entry.sha256
+        ]
+
+
+@lru_cache(maxsize=None)
+def default_store() -> Optional[InputStore]:
+    """The store under AOCD_DIR, opened once per process, or None if nothing has been packed yet."""
+    store = InputStore(default_store_root())
+    return store if store.index_path.exists() else None
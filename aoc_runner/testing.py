@@ -0,0 +1,129 @@
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from .batch import init_worker
+from .days import input_override, load_day, phase_function
+
+
+@dataclass
+class CaseResult:
+    year: int
+    day: int
+    index: int
+    function: str = ""
+    expected: str = ""
+    got: Optional[str] = None
+    elapsed: float = 0
+    error: Optional[str] = None
+
+    @property
+    def name(self):
+        return f"{self.year}/{self.day:02}#{self.index + 1} {self.function}"
+
+    @property
+    def passed(self):
+        return self.error is None and self.got == self.expected
+
+    def as_dict(self):
+        return dict(asdict(self), passed=self.passed)
+
+
+def collect_cases(days: Iterable[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
+    """(year, day, index) for every entry in each day module's tests list."""
+    cases = []
+    for year, day in days:
+        day_module = load_day(year, day)
+        if day_module is None:
+            continue
+        cases.extend(
+            (year, day, i) for i in range(len(getattr(day_module, "tests", [])))
+        )
+    return cases
+
+
+def run_case(year: int, day: int, index: int) -> CaseResult:
+    """Run one (input, expected, function) entry from a day module's tests list."""
+    day_module = load_day(year, day)
+    if day_module is None:
+        return CaseResult(year, day, index, error="module could not be loaded")
+    return check_case(day_module, index)
+
+
+def check_case(day_module: ModuleType, index: int) -> CaseResult:
+    """Run one entry from the tests list of an already imported module, which may be a variant or __main__.
+
+    The aocd.get_data override is undone afterwards, so one case can't leak its input into the next one.
+    """
+    # from the file, since some modules' aoc_day is wrong and only corrected when imported under their real name
+    path = Path(day_module.__file__)
+    year = int(path.parent.name.removeprefix("aoc_"))
+    day = int(re.match(r"day(\d+)", path.stem).group(1))
+    result = CaseResult(year, day, index)
+    text, expected, fn = day_module.tests[index]
+    result.function = fn.__name__
+    result.expected = f"{expected}"
+    preprocess = phase_function(day_module, "preprocess") or (lambda: [])
+    start = time.perf_counter()
+    try:
+        with input_override(text):
+            result.got = f"{fn(preprocess())}"
+    except Exception as e:
+        result.error = repr(e)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_cases(
+    cases: List[Tuple[int, int, int]],
+    jobs: Optional[int] = None,
+    log_level: str = "SUCCESS",
+) -> List[CaseResult]:
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=(log_level,)
+    ) as pool:
+        futures = [pool.submit(run_case, *case) for case in cases]
+        return [_log_result(f.result()) for f in futures]
+
+
+def run_module_cases(
+    module_name: str, start: int = 0, finish: Optional[int] = None
+) -> List[CaseResult]:
+    """Run tests[start:finish] of an imported module in this process, for its test() and `aoc run -p 0`.
+
+    Working in process keeps the module's own state, like a debug flag set before the call, and a debugger usable.
+    """
+    day_module = sys.modules[module_name]
+    indexes = range(len(day_module.tests))[start:finish]
+    return [_log_result(check_case(day_module, i)) for i in indexes]
+
+
+def _log_result(r: CaseResult) -> CaseResult:
+    if r.passed:
+        logger.info(f"{r.name}: {r.got} ({r.elapsed:.6f}s)")
+    elif r.error:
+        logger.error(f"{r.name}: {r.error}")
+    else:
+        logger.error(f"{r.name}: got {r.got}, expected {r.expected}")
+    return r
+
+
+def format_summary(results: List[CaseResult], slowest: int = 10) -> str:
+    passed = sum(r.passed for r in results)
+    lines = [
+        f"{passed} passed, {len(results) - passed} failed, "
+        f"{sum(r.elapsed for r in results):.3f}s total test time"
+    ]
+    if slowest:
+        lines.append(f"slowest {min(slowest, len(results))}:")
+        for r in sorted(results, key=lambda r: r.elapsed, reverse=True)[:slowest]:
+            status = "ok" if r.passed else "FAIL"
+            lines.append(f"{r.elapsed:>10.6f}s {status:<4} {r.name}")
+    return "\n".join(lines)
@@ -0,0 +1,202 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from .cache import module_hash, text_hash
+from .days import load_day
+from .variants import Variant, VariantResult, compare_variants, part_variants
+
+SCHEMA = """
+create table if not exists choices (
+    year integer not null,
+    day integer not null,
+    part integer not null,
+    bucket integer not null,
+    variant text not null,
+    elapsed real not null,
+    default_elapsed real,
+    measured_at real not null,
+    module_hash text not null,
+    primary key (year, day, part, bucket)
+)
+"""
+
+
+def tuning_path(cache_root: Path) -> Path:
+    return cache_root / "tuning.sqlite3"
+
+
+def variant_hash(day_module: ModuleType, variant: Variant) -> str:
+    """What a choice was measured against: the day's source, the variant's, and everything either imports.
+
+    An edit to either one can change which is faster, or whether the variant still agrees with the default.
+    """
+    return text_hash(
+        f"{module_hash(day_module)}:{module_hash(variant.module)}:{variant.name}"
+    )
+
+
+def size_bucket(text: str) -> int:
+    """floor(log2(input size in bytes)), so inputs within a factor of two of each other share a choice."""
+    return max(0, len(text.encode()).bit_length() - 1)
+
+
+@dataclass
+class Choice:
+    year: int
+    day: int
+    part: int
+    bucket: int
+    variant: str
+    elapsed: float
+    default_elapsed: Optional[float]
+    measured_at: float
+    module_hash: str
+
+
+class TuningStore:
+    """The fastest variant of each part, per power-of-two input size bucket, in a small sqlite database."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        columns = [row[1] for row in self.db.execute("pragma table_info(choices)")]
+        if columns and "module_hash" not in columns:
+            # choices from before they were tied to the source can't be checked for staleness, so they go
+            logger.warning(
+                f"{path} predates source hashes in tuning choices; run `aoc tune` again"
+            )
+            with self.db:
+                self.db.execute("drop table choices")
+        self.db.execute(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(
+        self,
+        year: int,
+        day: int,
+        part: int,
+        bucket: int,
+        variant: str,
+        elapsed: float,
+        default_elapsed: Optional[float],
+        source_hash: str,
+    ):
+        with self.db:
+            self.db.execute(
+                "insert or replace into choices values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    year,
+                    day,
+                    part,
+                    bucket,
+                    variant,
+                    elapsed,
+                    default_elapsed,
+                    time.time(),
+                    source_hash,
+                ),
+            )
+
+    def choices(
+        self, year: Optional[int] = None, day: Optional[int] = None
+    ) -> List[Choice]:
+        rows = self.db.execute(
+            "select * from choices where (? is null or year = ?) and (? is null or day = ?) "
+            "order by year, day, part, bucket",
+            (year, year, day, day),
+        )
+        return [Choice(*row) for row in rows]
+
+    def choice(self, year: int, day: int, part: int, bucket: int) -> Optional[Choice]:
+        """The choice for this bucket, or failing that the one calibrated on the nearest size."""
+        row = self.db.execute(
+            "select * from choices where year = ? and day = ? and part = ? "
+            "order by abs(bucket - ?), bucket limit 1",
+            (year, day, part, bucket),
+        ).fetchone()
+        return Choice(*row) if row else None
+
+
+def tune_part(
+    store: TuningStore,
+    year: int,
+    day: int,
+    part: int,
+    text: str,
+    repeat: int = 3,
+    warmup: int = 1,
+) -> Tuple[List[VariantResult], Optional[VariantResult]]:
+    """Time every variant of a part on text and store the fastest one that agrees with the default's answer."""
+    results = compare_variants(year, day, part, text, repeat, warmup)
+    agreeing = [r for r in results if r.error is None and r.agrees]
+    if not agreeing:
+        return results, None
+    winner = agreeing[0]
+    default = next((r for r in agreeing if r.default), None)
+    variant = next(v for v in part_variants(year, day, part) if v.name == winner.name)
+    store.record(
+        year,
+        day,
+        part,
+        size_bucket(text),
+        winner.name,
+        winner.total,
+        default.total if default else None,
+        variant_hash(load_day(year, day), variant),
+    )
+    return results, winner
+
+
+def tuned_variant(
+    store: TuningStore, year: int, day: int, part: int, text: str
+) -> Optional[Variant]:
+    """The variant calibration picked for an input of this size, if there is one, it's still registered, and
+    neither it nor the day has changed since."""
+    choice = store.choice(year, day, part, size_bucket(text))
+    if choice is None:
+        return None
+    for variant in part_variants(year, day, part):
+        if variant.name == choice.variant:
+            if variant_hash(load_day(year, day), variant) != choice.module_hash:
+                logger.warning(
+                    f"Tuned variant {choice.variant} for year={year} day={day} part{part} was measured against "
+                    f"code that has since changed; run `aoc tune` again"
+                )
+                return None
+            return variant
+    logger.warning(
+        f"Tuned variant {choice.variant} for year={year} day={day} part{part} is no longer registered"
+    )
+    return None
+
+
+def tuned_solver(variant: Variant, day_module: ModuleType) -> Callable:
+    """A solver that can take day_module's context. Variants from sibling modules preprocess their own."""
+    if variant.module is day_module:
+        return variant.solver
+    return lambda _: variant.solver(variant.preprocess())
+
+
+def format_choices(choices: List[Choice]) -> str:
+    header = f"{'year':>4} {'day':>3} {'part':>4} {'bytes':>12} {'variant':<20} {'time':>10} {'speedup':>8}"
+    lines = [header, "-" * len(header)]
+    for c in choices:
+        speedup = (
+            f"{c.default_elapsed / c.elapsed:>7.2f}x"
+            if c.default_elapsed and c.elapsed
+            else f"{'-':>8}"
+        )
+        lines.append(
+            f"{c.year:>4} {c.day:>3} {c.part:>4} {'2^' + str(c.bucket):>12} {c.variant:<20} "
+            f"{c.elapsed:>10.6f} {speedup}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+import importlib
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+from .bench import PhaseStats
+from .days import input_override, load_day, phase_function
+from .phases import format_bytes, measure
+
+
+@dataclass
+class Variant:
+    """One implementation of a part.
+
+    Day modules register alternates in a module-level dict, next to their tests list:
+
+        variants = {"part2": [part2_fast], "part1": ["day20_slow"]}
+
+    A function entry is another implementation in the same module, taking the same context. A string entry names
+    a sibling module in the same package whose own preprocess() and part of the same name are the alternate. The
+    module's plain partN is always the default variant.
+    """
+
+    name: str
+    module: ModuleType
+    solver: Callable
+    default: bool = False
+
+    @property
+    def preprocess(self) -> Callable:
+        return phase_function(self.module, "preprocess") or (lambda: [])
+
+
+def part_variants(year: int, day: int, part: int) -> List[Variant]:
+    day_module = load_day(year, day)
+    if day_module is None:
+        return []
+    phase = f"part{part}"
+    found = []
+    default = phase_function(day_module, phase)
+    if default is not None:
+        found.append(Variant(phase, day_module, default, default=True))
+    for entry in getattr(day_module, "variants", {}).get(phase, ()):
+        if callable(entry):
+            found.append(Variant(entry.__name__, day_module, entry))
+            continue
+        try:
+            sibling = importlib.import_module(f".{entry}", day_module.__package__)
+        except (ImportError, SystemExit) as e:
+            logger.error(f"Variant module {entry} could not be loaded: {e}")
+            continue
+        solver = phase_function(sibling, phase)
+        if solver is None:
+            logger.error(f"Variant module {entry} has no {phase} function")
+            continue
+        found.append(Variant(f"{entry}.{phase}", sibling, solver))
+    return found
+
+
+@dataclass
+class VariantResult:
+    name: str
+    default: bool
+    answer: Optional[str] = None
+    preprocess: PhaseStats = field(default_factory=PhaseStats)
+    solve: PhaseStats = field(default_factory=PhaseStats)
+    peak_memory: Optional[int] = None
+    agrees: Optional[bool] = None
+    error: Optional[str] = None
+
+    @property
+    def total(self):
+        return self.preprocess.median + self.solve.median
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "default": self.default,
+            "answer": self.answer,
+            "preprocess": self.preprocess.as_dict(),
+            "solve": self.solve.as_dict(),
+            "peak_memory": self.peak_memory,
+            "agrees": self.agrees,
+            "error": self.error,
+        }
+
+
+def compare_variants(
+    year: int,
+    day: int,
+    part: int,
+    text: str,
+    repeat: int = 5,
+    warmup: int = 1,
+    memory: Optional[str] = None,
+) -> List[VariantResult]:
+    """Run every variant of a part on the same input, fastest first.
+
+    Each run preprocesses a fresh context with the variant's own module, and both phases are timed, since sibling
+    module variants may split their work between preprocess and the part differently. Answers are checked against
+    the default variant's, or the first variant that produced one.
+    """
+    results = []
+    with input_override(text):
+        for variant in part_variants(year, day, part):
+            result = VariantResult(variant.name, variant.default)
+            try:
+                for i in range(warmup + repeat):
+                    context, pre = measure("preprocess", variant.preprocess)
+                    answer, solve = measure(variant.name, variant.solver, context)
+                    if i >= warmup:
+                        result.preprocess.samples.append(pre.elapsed)
+                        result.solve.samples.append(solve.elapsed)
+                result.answer = str(answer)
+                if memory:
+                    context = variant.preprocess()
+                    result.peak_memory = measure(
+                        variant.name, variant.solver, context, memory=memory
+                    )[1].peak_memory
+            except Exception as e:
+                logger.error(f"{variant.name} failed: {e!r}")
+                result.error = repr(e)
+            results.append(result)
+    answered = [r for r in results if r.answer is not None]
+    reference = next((r for r in answered if r.default), None) or next(
+        iter(answered), None
+    )
+    for r in answered:
+        r.agrees = r.answer == reference.answer
+    return sorted(
+        results, key=lambda r: (r.error is not None, 0 if r.error else r.total)
+    )
+
+
+def format_variants(results: List[VariantResult]) -> str:
+    show_memory = any(r.peak_memory is not None for r in results)
+    header = (
+        f"{'variant':<20} {'preprocess':>10} {'solve':>10} {'total':>10} {'vs best':>8}"
+    )
+    if show_memory:
+        header += f" {'peak memory':>12}"
+    header += "  answer"
+    lines = [header, "-" * len(header)]
+    best = next((r.total for r in results if r.error is None), None)
+    for r in results:
+        name = f"{r.name}{' *' if r.default else ''}"
+        if r.error:
+            lines.append(f"{name:<20} error: {r.error}")
+            continue
+        line = (
+            f"{name:<20} {r.preprocess.median:>10.6f} {r.solve.median:>10.6f} {r.total:>10.6f} "
+            f"{r.total / best if best else 1:>7.2f}x"
+        )
+        if show_memory:
+            line += f" {format_bytes(r.peak_memory):>12}"
+        line += f"  {r.answer}{'' if r.agrees else '  DISAGREES'}"
+        lines.append(line)
+    return "\n".join(lines)